@@ -13,6 +13,9 @@ load_dotenv()
 APP_DIR = pathlib.Path(__file__).parent.absolute()
 DATA_DIR = pathlib.Path.home() / ".ez_clip_app"
 DB_PATH = DATA_DIR / "transcripts.db"
+PREVIEW_CACHE_DIR = DATA_DIR / "cache"
+# Least-recently-used preview clips are evicted above this size
+PREVIEW_CACHE_MAX_BYTES = int(os.environ.get("PREVIEW_CACHE_MAX_MB", "2048")) * 1024 * 1024
 
 # Ensure data directory exists
 DATA_DIR.mkdir(exist_ok=True)
@@ -20,25 +23,60 @@ DATA_DIR.mkdir(exist_ok=True)
 # WhisperX model configuration
 DEFAULT_MODEL_SIZE = "turbo"  # tiny, base, small, medium, large-v1, large-v2, turbo
 DEFAULT_LANGUAGE = "en"        # ISO language code, "auto" for auto-detection
+SAMPLE_RATE = 16000             # WhisperX and pyannote both expect 16 kHz mono
 DEVICE = "cuda" if os.environ.get("USE_GPU", "").lower() == "true" else "cpu"
+# CTranslate2 compute type: int8 quantization on CPU, fp16 on GPU
+# (also accepts e.g. "int8_float16", "int8_bfloat16", "float32")
+COMPUTE_TYPE = os.environ.get("EZCLIP_COMPUTE_TYPE") or (
+    "float16" if DEVICE == "cuda" else "int8"
+)
 
 # Diarization configuration
 DEFAULT_MIN_SPEAKERS = 1
 DEFAULT_MAX_SPEAKERS = 4
+DIARIZATION_BATCH_SIZE = int(os.environ.get("DIARIZATION_BATCH_SIZE", "32"))
 
 # HuggingFace token for pyannote.audio
 HF_TOKEN = os.environ.get("HF_TOKEN")
 
+# Model server (see core/model_server.py)
+MODEL_SERVER_SOCKET = pathlib.Path(
+    os.environ.get("EZCLIP_MODEL_SOCKET", DATA_DIR / "model_server.sock")
+)
+# Shared secret for the socket: EZCLIP_MODEL_AUTHKEY if set, otherwise a random
+# key generated on first use into MODEL_SERVER_AUTHKEY_FILE (mode 0600)
+MODEL_SERVER_AUTHKEY = os.environ.get("EZCLIP_MODEL_AUTHKEY")
+MODEL_SERVER_AUTHKEY_FILE = DATA_DIR / "model_server.key"
+
 # Threading configuration
 MAX_WORKERS = int(os.environ.get("MAX_WORKERS", "2"))
 MAX_CONCURRENT_JOBS = 1
+# Parallel chunked transcription: audio longer than TRANSCRIBE_CHUNK_SEC is
+# split on silences and chunks are transcribed by TRANSCRIBE_WORKERS threads,
+# each on its own WhisperX pipeline over one shared model (see model_cache)
+TRANSCRIBE_WORKERS = int(os.environ.get("TRANSCRIBE_WORKERS", "1"))
+TRANSCRIBE_CHUNK_SEC = float(os.environ.get("TRANSCRIBE_CHUNK_SEC", "600"))
+
+# Export: ranges are stream-copied when every cut starts on a keyframe and
+# re-encoded otherwise; EXPORT_FRAME_ACCURATE always re-encodes
+EXPORT_FRAME_ACCURATE = os.environ.get("EXPORT_FRAME_ACCURATE", "").lower() == "true"
+# libx264 settings for re-encoded exports
+EXPORT_X264_PRESET = os.environ.get("EXPORT_X264_PRESET", "veryfast")
+EXPORT_X264_CRF = int(os.environ.get("EXPORT_X264_CRF", "20"))
 
 # UI configuration
-POLL_INTERVAL_MS = 500  # How often to update progress in UI
+# Progress is pushed by the workers; the DB is only polled as a safety net
+# (e.g. for other writers) while jobs are active. The poll runs every
+# POLL_INTERVAL_MS while progress is moving and backs off to
+# POLL_INTERVAL_MAX_MS once it stalls.
+POLL_INTERVAL_MS = int(os.environ.get("POLL_INTERVAL_MS", "250"))
+POLL_INTERVAL_MAX_MS = int(os.environ.get("POLL_INTERVAL_MAX_MS", "2000"))
 
 # Status values for database
 class Status:
     QUEUED = "queued"
     RUNNING = "running"
     DONE = "done"
-    ERROR = "error"
\ No newline at end of file
+    ERROR = "error"
+    # Statuses shown as in-progress jobs (inlined into the active-jobs query)
+    ACTIVE = (QUEUED, RUNNING)
\ No newline at end of file
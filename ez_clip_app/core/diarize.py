@@ -4,195 +4,384 @@ PyAnnote wrapper for speaker diarization.
 import logging
 import typing as t
 from pathlib import Path
-import whisperx
 from typing import List, Dict
 import json
 import os
 import traceback
-import pandas as pd  # Added for DataFrame conversion in assign_word_speakers
+import numpy as np
 
-from ez_clip_app.core import model_cache
-from ez_clip_app.config import DEFAULT_MIN_SPEAKERS, DEFAULT_MAX_SPEAKERS
+from ez_clip_app.core import model_cache, model_server
+from ez_clip_app.config import DEFAULT_MIN_SPEAKERS, DEFAULT_MAX_SPEAKERS, SAMPLE_RATE
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Resolution (seconds) of the speaker grid used by the fallback assignment
+_GRID_STEP = 0.5
 
-def _annotation_to_turns(annotation) -> List[Dict]:
+
+def _annotation_to_turns(annotation) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Convert pyannote.core.Annotation into WhisperX-compatible
-    list of speaker turns.
+    speaker-turn columns.
+
+    Returns:
+        ``(starts, ends, speakers)`` arrays sorted by start time; speaker IDs
+        have the ``SPEAKER_`` prefix stripped.
     """
-    turns = []
+    starts, ends, raw_labels = [], [], []
     for segment, _, label in annotation.itertracks(yield_label=True):
-        label_str = str(label)
-        speaker_id = label_str.removeprefix("SPEAKER_")
-        turns.append(
-            {
-                "start": float(segment.start),
-                "end":   float(segment.end),
-                "speaker": speaker_id,
-            }
-        )
+        starts.append(float(segment.start))
+        ends.append(float(segment.end))
+        raw_labels.append(str(label))
+
+    # Strip the SPEAKER_ prefix once per distinct label, not once per turn
+    lut, inverse = np.unique(np.asarray(raw_labels, dtype=object), return_inverse=True)
+    lut = np.asarray([label.removeprefix("SPEAKER_") for label in lut], dtype=object)
+    speakers = lut[inverse.reshape(-1)]
+
     # sort just in case
-    turns = sorted(turns, key=lambda t: t["start"])
+    order = np.argsort(np.asarray(starts, dtype=np.float64), kind="stable")
+    starts = np.asarray(starts, dtype=np.float64)[order]
+    ends = np.asarray(ends, dtype=np.float64)[order]
+    speakers = speakers[order]
     
     if os.getenv("EZCLIP_DBG"):
-        logger.debug("[DBG] speaker_turns sample (raw IDs): %s", turns[:3])
+        logger.debug("[DBG] speaker_turns sample (raw IDs): %s",
+                     _turns_sample(starts, ends, speakers, 3))
         
-    return turns
+    return starts, ends, speakers
 
 
-def diarize(
-    audio_path: t.Union[str, Path],
-    transcription_segments: t.List[dict],
+def _turns_sample(starts, ends, speakers, n: int) -> List[Dict]:
+    """Return the first *n* speaker turns as dicts (debug output only)."""
+    return [
+        {"start": float(s), "end": float(e), "speaker": sp}
+        for s, e, sp in zip(starts[:n], ends[:n], speakers[:n])
+    ]
+
+
+def _assign_speakers_by_grid(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    speakers: np.ndarray,
+    segments: List[Dict],
+) -> List[Dict]:
+    """Assign each segment the majority speaker sampled on a uniform time grid.
+
+    Fallback used when ``whisperx.assign_word_speakers`` fails. Speaker turns are
+    sampled every ``_GRID_STEP`` seconds and each segment takes the label that
+    covers most of the ticks inside ``[start, end)``.
+
+    Args:
+        starts: Turn start times from ``_annotation_to_turns`` (sorted)
+        ends: Turn end times
+        speakers: Turn speaker IDs
+        segments: Transcription segments, updated in place with a ``speaker`` key
+
+    Returns:
+        The same list of segments
+    """
+    if not len(starts):
+        for segment in segments:
+            segment["speaker"] = "SPEAKER_UNKNOWN"
+        return segments
+
+    labels, label_idx = np.unique(speakers, return_inverse=True)
+    label_idx = label_idx.reshape(-1).astype(np.int32)
+
+    # Turn k covers grid ticks [ceil(start/step), ceil(end/step)). Expand all
+    # turns at once with np.repeat and scatter them onto the grid; later turns
+    # win on overlap and uncovered ticks stay -1.
+    first = np.ceil(starts / _GRID_STEP).astype(np.int64)
+    n_ticks = np.maximum(np.ceil(ends / _GRID_STEP).astype(np.int64) - first, 0)
+    offsets = np.cumsum(n_ticks) - n_ticks
+    ticks = np.repeat(first - offsets, n_ticks) + np.arange(int(n_ticks.sum()))
+    grid_speakers = np.full(int(ticks.max()) + 1 if ticks.size else 0, -1, dtype=np.int32)
+    grid_speakers[ticks] = np.repeat(label_idx, n_ticks)
+
+    # Per-speaker running tick counts: counts[k, j] is the number of ticks
+    # before tick k labelled with speaker j, so any segment's tally is the
+    # difference of two rows.
+    n_ticks_total = grid_speakers.size
+    covered = np.flatnonzero(grid_speakers >= 0)
+    counts = np.zeros((n_ticks_total + 1, len(labels)), dtype=np.int32)
+    counts[covered + 1, grid_speakers[covered]] = 1
+    np.cumsum(counts, axis=0, out=counts)
+
+    # The grid is uniform, so tick k sits at k * _GRID_STEP and a segment's
+    # ticks are found by arithmetic rather than a search.
+    seg_starts = np.fromiter((seg.get("start", 0) for seg in segments), dtype=np.float64)
+    seg_ends = np.fromiter((seg.get("end", 0) for seg in segments), dtype=np.float64)
+    lo = np.clip(np.ceil(seg_starts / _GRID_STEP).astype(np.int64), 0, n_ticks_total)
+    hi = np.clip(np.ceil(seg_ends / _GRID_STEP).astype(np.int64), lo, n_ticks_total)
+
+    seg_counts = counts[hi] - counts[lo]
+    winners = labels[seg_counts.argmax(axis=1)].tolist()
+    has_speaker = (seg_counts.max(axis=1) > 0).tolist()
+
+    for segment, winner, found in zip(segments, winners, has_speaker):
+        segment["speaker"] = str(winner) if found else "SPEAKER_UNKNOWN"
+
+    return segments
+
+
+# Speaker turns as (starts, ends, speakers) arrays; see _annotation_to_turns
+Turns = t.Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def diarize_audio(
+    audio: t.Union[str, Path, np.ndarray],
     min_speakers: int = DEFAULT_MIN_SPEAKERS,
-    max_speakers: int = DEFAULT_MAX_SPEAKERS,
+    max_speakers: int = DEFAULT_MAX_SPEAKERS
+) -> Turns:
+    """Run the diarization model on *audio* and return its speaker turns.
+    
+    Only needs the audio, so it can run concurrently with transcription;
+    combine the two afterwards with :func:`assign_speakers`. Uses a running
+    model server when available.
+    
+    Args:
+        audio: Audio file path or 16 kHz waveform from extract_audio()
+        min_speakers: Minimum number of speakers to detect
+        max_speakers: Maximum number of speakers to detect
+        
+    Returns:
+        Speaker turns sorted by start time
+    """
+    remote = model_server.connect()
+    if remote is not None:
+        try:
+            return remote.diarize_audio(
+                audio if isinstance(audio, np.ndarray) else str(audio),
+                min_speakers=min_speakers,
+                max_speakers=max_speakers
+            )
+        except model_server.TRANSPORT_ERRORS as e:
+            logger.warning(f"Model server connection failed, running in-process: {e}")
+    
+    return diarize_audio_local(audio, min_speakers, max_speakers)
+
+
+def diarize_audio_local(
+    audio: t.Union[str, Path, np.ndarray],
+    min_speakers: int = DEFAULT_MIN_SPEAKERS,
+    max_speakers: int = DEFAULT_MAX_SPEAKERS
+) -> Turns:
+    """Run the diarization model on *audio* in this process.
+    
+    Args:
+        audio: Audio file path or 16 kHz waveform from extract_audio()
+        min_speakers: Minimum number of speakers to detect
+        max_speakers: Maximum number of speakers to detect
+        
+    Returns:
+        Speaker turns sorted by start time
+    """
+    logger.info("Starting speaker diarization")
+    
+    # Load diarization model
+    diarize_pipeline = model_cache.get_diarization_model()
+    
+    # pyannote takes either a file path or an in-memory waveform dict
+    if isinstance(audio, np.ndarray):
+        import torch
+        audio_input = {
+            "waveform": torch.from_numpy(audio).unsqueeze(0),
+            "sample_rate": SAMPLE_RATE,
+        }
+    else:
+        audio_input = str(audio)
+    
+    # Perform diarization
+    annotation = diarize_pipeline(
+        audio_input,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers
+    )
+    return _annotation_to_turns(annotation)
+
+
+def assign_speakers(
+    turns: Turns,
+    transcription_segments: t.List[dict],
     progress_callback: t.Callable[[float], None] = None
 ) -> t.List[dict]:
-    """Perform speaker diarization on transcribed segments.
+    """Label transcription segments (and their words) with speakers from *turns*.
     
     Args:
-        audio_path: Path to audio file
+        turns: Speaker turns from :func:`diarize_audio`
         transcription_segments: List of transcription segments from WhisperX
-        min_speakers: Minimum number of speakers to detect
-        max_speakers: Maximum number of speakers to detect
         progress_callback: Optional callback function to report progress (0-100)
         
     Returns:
         Updated list of segments with speaker labels
     """
-    audio_path = Path(audio_path)
-    logger.info(f"Starting speaker diarization for {audio_path}")
+    starts, ends, speakers = turns
+    
+    if os.getenv("EZCLIP_DBG") and transcription_segments:
+        logger.debug(
+            "[DBG] transcription_segments[0]: %s | keys=%s",
+            transcription_segments[0],
+            list(transcription_segments[0].keys()))
+        logger.debug(
+            "[DBG] speaker_turns[0]: %s",
+            _turns_sample(starts, ends, speakers, 1))
+        logger.debug(
+            "[DBG] Counts → turns=%d, segments=%d",
+            len(starts), len(transcription_segments))
+    
+    # Update progress
+    if progress_callback:
+        progress_callback(80)
     
     try:
-        # Load diarization model
-        diarize_pipeline = model_cache.get_diarization_model()
+        # Heavy imports are deferred to keep process start-up fast
+        import pandas as pd
+        import whisperx
+
+        # whisperx.assign_word_speakers expects a pandas DataFrame
+        # with at least [start, end, speaker] columns. Build it straight
+        # from the turn columns so pandas skips per-row dtype inference.
+        diarize_df = pd.DataFrame(
+            {"start": starts, "end": ends, "speaker": speakers},
+            copy=False,
+        )
+
+        # Defensive check – ensure required columns exist to avoid
+        # downstream KeyErrors should whisperX change its API.
+        required_cols = {"start", "end", "speaker"}
+        if not required_cols.issubset(diarize_df.columns):
+            missing = required_cols - set(diarize_df.columns)
+            raise RuntimeError(
+                f"Diarization DataFrame missing expected columns: {missing}"
+            )
+
+        transcript_dict = {"segments": transcription_segments}
+        result = whisperx.assign_word_speakers(diarize_df, transcript_dict)
         
         # Update progress
         if progress_callback:
-            progress_callback(70)
+            progress_callback(90)
         
-        # Perform diarization
-        annotation = diarize_pipeline(
-            str(audio_path),
-            min_speakers=min_speakers,
-            max_speakers=max_speakers
-        )
-        speaker_turns = _annotation_to_turns(annotation)
-        
-        if os.getenv("EZCLIP_DBG") and transcription_segments:
-            logger.debug(
-                "[DBG] transcription_segments[0]: %s | keys=%s",
-                transcription_segments[0],
-                list(transcription_segments[0].keys()))
-            logger.debug(
-                "[DBG] speaker_turns[0]: %s | keys=%s",
-                speaker_turns[0],
-                list(speaker_turns[0].keys()))
-            logger.debug(
-                "[DBG] Counts → turns=%d, segments=%d",
-                len(speaker_turns), len(transcription_segments))
+        logger.info(f"Diarization completed: {len(result['segments'])} segments")
+        
+        return result["segments"]
+    except Exception as exc:
+        logger.error("assign_word_speakers() failed: %s", exc)
+        logger.error(traceback.format_exc())
+
+        if os.getenv("EZCLIP_DBG"):
+            dump = {
+                "speaker_turns": _turns_sample(starts, ends, speakers, 10),
+                "transcription_segments": transcription_segments[:10],
+                "exception": str(exc),
+                "traceback": traceback.format_exc(),
+            }
+            dump_path = Path("/tmp/ezclip_dbg_assign_word_speakers.json")
+            dump_path.write_text(json.dumps(dump, indent=2))
+            logger.warning("[DBG] dumped payload to %s", dump_path)
+
+        # Handle the case where assignment fails
+        logger.warning(f"Speaker assignment failed: {exc}. Falling back to simple assignment.")
+        
+        # Fall back to a simpler speaker assignment approach
+        # (labels are written into the segment dicts in place)
+        _assign_speakers_by_grid(starts, ends, speakers, transcription_segments)
         
         # Update progress
         if progress_callback:
-            progress_callback(80)
+            progress_callback(90)
+        
+        if os.getenv("EZCLIP_DBG"):
+            logger.debug("[DBG] simple-assignment speakers present: %s",
+                         {s['speaker'] for s in transcription_segments})
+        
+        logger.info(f"Simple diarization completed: {len(transcription_segments)} segments")
+        
+        return transcription_segments
+
+
+def diarize(
+    audio: t.Union[str, Path, np.ndarray],
+    transcription_segments: t.List[dict],
+    min_speakers: int = DEFAULT_MIN_SPEAKERS,
+    max_speakers: int = DEFAULT_MAX_SPEAKERS,
+    progress_callback: t.Callable[[float], None] = None,
+    turns: t.Optional[Turns] = None
+) -> t.List[dict]:
+    """Perform speaker diarization on transcribed segments.
+    
+    Uses the resident pipeline of a running model server when one is
+    available, otherwise loads the model in-process.
+    
+    Args:
+        audio: Audio file path or 16 kHz waveform from extract_audio()
+        transcription_segments: List of transcription segments from WhisperX
+        min_speakers: Minimum number of speakers to detect
+        max_speakers: Maximum number of speakers to detect
+        progress_callback: Optional callback function to report progress (0-100)
+        turns: Speaker turns already computed by :func:`diarize_audio`; when
+            given, only the speaker assignment step runs
         
+    Returns:
+        Updated list of segments with speaker labels
+    """
+    if turns is not None:
+        return assign_speakers(turns, transcription_segments, progress_callback)
+    
+    remote = model_server.connect()
+    if remote is not None:
         try:
-            # whisperx.assign_word_speakers expects a pandas DataFrame
-            # with at least [start, end, speaker] columns. Convert our
-            # list-of-dict speaker_turns into the required format.
-
-            diarize_df = pd.DataFrame(speaker_turns)
-
-            # Defensive check – ensure required columns exist to avoid
-            # downstream KeyErrors should whisperX change its API.
-            required_cols = {"start", "end", "speaker"}
-            if not required_cols.issubset(diarize_df.columns):
-                missing = required_cols - set(diarize_df.columns)
-                raise RuntimeError(
-                    f"Diarization DataFrame missing expected columns: {missing}"
-                )
-
-            transcript_dict = {"segments": transcription_segments}
-            result = whisperx.assign_word_speakers(diarize_df, transcript_dict)
-            
-            # Update progress
             if progress_callback:
-                progress_callback(90)
-            
-            logger.info(f"Diarization completed: {len(result['segments'])} segments")
-            
-            return result["segments"]
-        except Exception as exc:
-            logger.error("assign_word_speakers() failed: %s", exc)
-            logger.error(traceback.format_exc())
-
-            if os.getenv("EZCLIP_DBG"):
-                dump = {
-                    "speaker_turns": speaker_turns[:10],
-                    "transcription_segments": transcription_segments[:10],
-                    "exception": str(exc),
-                    "traceback": traceback.format_exc(),
-                }
-                dump_path = Path("/tmp/ezclip_dbg_assign_word_speakers.json")
-                dump_path.write_text(json.dumps(dump, indent=2))
-                logger.warning("[DBG] dumped payload to %s", dump_path)
-
-            # Handle the case where assignment fails
-            logger.warning(f"Speaker assignment failed: {exc}. Falling back to simple assignment.")
-            
-            # Fall back to a simpler speaker assignment approach
-            segments = transcription_segments.copy()
-            
-            # Create a mapping of time to speaker
-            speaker_map = {}
-            for segment, _, label in annotation.itertracks(yield_label=True):
-                start_time = float(segment.start)
-                end_time = float(segment.end)
-                label_str = str(label)
-                speaker = label_str.removeprefix("SPEAKER_")
-                
-                # Store speaker for each second (with 0.5s resolution)
-                current_time = start_time
-                while current_time < end_time:
-                    speaker_map[current_time] = speaker
-                    current_time += 0.5
-            
-            # Assign speakers to segments
-            for segment in segments:
-                segment_start = segment.get("start", 0)
-                segment_end = segment.get("end", 0)
-                
-                # Find the most common speaker in this segment
-                speaker_counts = {}
-                current_time = segment_start
-                while current_time < segment_end:
-                    # Find the closest time key in speaker_map
-                    closest_time = min(speaker_map.keys(), key=lambda x: abs(x - current_time), default=None)
-                    if closest_time is not None and abs(closest_time - current_time) < 1.0:
-                        speaker = speaker_map[closest_time]
-                        speaker_counts[speaker] = speaker_counts.get(speaker, 0) + 1
-                    current_time += 0.5
-                
-                # Assign the most common speaker, or a default if none found
-                if speaker_counts:
-                    most_common_speaker = max(speaker_counts.items(), key=lambda x: x[1])[0]
-                    segment["speaker"] = most_common_speaker  # Already has SPEAKER_ prefix
-                else:
-                    segment["speaker"] = "SPEAKER_UNKNOWN"
-            
-            # Update progress
+                progress_callback(70)
+            segments = remote.diarize(
+                audio if isinstance(audio, np.ndarray) else str(audio),
+                transcription_segments,
+                min_speakers=min_speakers,
+                max_speakers=max_speakers
+            )
             if progress_callback:
                 progress_callback(90)
-            
-            if os.getenv("EZCLIP_DBG"):
-                logger.debug("[DBG] simple-assignment speakers present: %s",
-                             {s['speaker'] for s in segments})
-            
-            logger.info(f"Simple diarization completed: {len(segments)} segments")
-            
             return segments
+        except model_server.TRANSPORT_ERRORS as e:
+            logger.warning(f"Model server connection failed, running in-process: {e}")
+    
+    return diarize_local(
+        audio,
+        transcription_segments,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers,
+        progress_callback=progress_callback
+    )
+
+
+def diarize_local(
+    audio: t.Union[str, Path, np.ndarray],
+    transcription_segments: t.List[dict],
+    min_speakers: int = DEFAULT_MIN_SPEAKERS,
+    max_speakers: int = DEFAULT_MAX_SPEAKERS,
+    progress_callback: t.Callable[[float], None] = None
+) -> t.List[dict]:
+    """Perform speaker diarization in this process.
+    
+    Args:
+        audio: Audio file path or 16 kHz waveform from extract_audio()
+        transcription_segments: List of transcription segments from WhisperX
+        min_speakers: Minimum number of speakers to detect
+        max_speakers: Maximum number of speakers to detect
+        progress_callback: Optional callback function to report progress (0-100)
+        
+    Returns:
+        Updated list of segments with speaker labels
+    """
+    try:
+        # Update progress
+        if progress_callback:
+            progress_callback(70)
+        
+        turns = diarize_audio_local(audio, min_speakers, max_speakers)
+        return assign_speakers(turns, transcription_segments, progress_callback)
     
     except Exception as e:
         logger.error(f"Error during diarization: {e}")
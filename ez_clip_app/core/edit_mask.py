@@ -6,8 +6,11 @@ in the final edited media file.
 """
 from dataclasses import dataclass, field
 from typing import List, Tuple
+import base64
 import json
 
+import numpy as np
+
 
 @dataclass
 class EditMask:
@@ -15,15 +18,44 @@ class EditMask:
     
     Attributes:
         media_id: Database ID for the associated media file
-        keep: List of boolean values indicating which words to keep (True) or cut (False)
+        keep: Boolean array indicating which words to keep (True) or cut (False);
+            lists assigned to it are converted
         kind: String identifying the mask format version
         _ranges: List of time ranges (start, end) in seconds (computed from keep[])
     """
     media_id: int
-    keep: List[bool]                 # len == total words
+    keep: np.ndarray                 # bool_, len == total words
     kind: str = "mask-v1"
     # ---------- non-serialised ----------
     _ranges: List[Tuple[float, float]] = field(init=False, default_factory=list)
+    # (words, starts, ends): word timings as arrays, rebuilt only when the
+    # caller passes a different word list
+    _times: tuple = field(init=False, default=None, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # Store keep[] packed as a NumPy bool array however it is assigned
+        if name == "keep":
+            value = np.asarray(value, dtype=np.bool_)
+        super().__setattr__(name, value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EditMask):
+            return NotImplemented
+        return (
+            self.media_id == other.media_id and self.kind == other.kind
+            and np.array_equal(self.keep, other.keep)
+        )
+
+    def _word_times(self, words) -> Tuple[np.ndarray, np.ndarray]:
+        """Return start/end times of *words* as float64 arrays (cached per list)."""
+        cached = self._times
+        if cached is not None and cached[0] is words and cached[1].size == len(words):
+            return cached[1], cached[2]
+        n = len(words)
+        starts = np.fromiter((w.s for w in words), dtype=np.float64, count=n)
+        ends = np.fromiter((w.e for w in words), dtype=np.float64, count=n)
+        self._times = (words, starts, ends)
+        return starts, ends
 
     # build once ------------------------------------------------------
     def build_ranges(self, words, glue_gap: float = 0.12) -> None:
@@ -36,47 +68,59 @@ class EditMask:
         Returns:
             None (modifies self._ranges in place)
         """
-        self._ranges = []
-        cur = None
-        for w, k in zip(words, self.keep):
-            if k:
-                if cur and (w.s - cur[1]) <= glue_gap:
-                    cur = (cur[0], w.e)    # extend
-                else:
-                    if cur: 
-                        self._ranges.append(cur)
-                    cur = (w.s, w.e)
-            else:
-                if cur: 
-                    self._ranges.append(cur)
-                    cur = None
-        if cur: 
-            self._ranges.append(cur)
+        n = min(len(words), len(self.keep))
+        keep = self.keep[:n]
+        starts, ends = self._word_times(words)
+        starts, ends = starts[:n], ends[:n]
+
+        kept = np.flatnonzero(keep)
+        if not kept.size:
+            self._ranges = []
+            return self._ranges
+
+        # A kept word opens a new range unless the previous word was kept too
+        # and the silence between them is within glue_gap.
+        opens = np.ones(kept.size, dtype=bool)
+        prev = kept[1:] - 1
+        opens[1:] = ~keep[prev] | ((starts[kept[1:]] - ends[prev]) > glue_gap)
+        closes = np.r_[opens[1:], True]
+
+        self._ranges = list(zip(starts[kept[opens]].tolist(), ends[kept[closes]].tolist()))
         return self._ranges
             
     def is_trivial(self) -> bool:
         """Return True if all words are kept (no editing needed)."""
-        return all(self.keep)
+        return bool(self.keep.all())
 
     # serialisation --------------------------------------------------
     def dumps(self) -> str:
         """Serialize to JSON string.
         
+        Masks of kind ``mask-v2`` are written in the bit-packed format
+        (see :meth:`dumps_packed`).
+        
         Returns:
             JSON string representation of the mask
         """
-        removed = []
-        s = None
-        for i, k in enumerate(self.keep):
-            if not k and s is None: 
-                s = i
-            if k and s is not None: 
-                removed.append([s, i])
-                s = None
-        if s is not None: 
-            removed.append([s, len(self.keep)])
+        if self.kind == "mask-v2":
+            return self.dumps_packed()
+        arr = self.keep
+        # Padding with kept words on both sides makes every cut run produce
+        # exactly one (start, end) pair of change positions.
+        changes = np.flatnonzero(np.diff(np.r_[True, arr, True]))
+        removed = changes.reshape(-1, 2).tolist()
         return json.dumps({"kind": self.kind, "remove": removed})
 
+    def dumps_packed(self) -> str:
+        """Serialize to a compact JSON string holding a base64 bitmap (1 bit/word).
+        
+        Returns:
+            JSON string representation of the mask in ``mask-v2`` format
+        """
+        arr = self.keep
+        bits = base64.b64encode(np.packbits(arr).tobytes()).decode("ascii")
+        return json.dumps({"kind": "mask-v2", "bits": bits, "n": int(arr.size)})
+
     @classmethod
     def loads(cls, media_id: int, json_str: str, total_words: int) -> "EditMask":
         """Deserialize from JSON string.
@@ -90,7 +134,21 @@ class EditMask:
             EditMask instance
         """
         data = json.loads(json_str)
-        keep = [True] * total_words
-        for s, e in data.get("remove", []): 
-            keep[s:e] = [False] * (e - s)
+        if "bits" in data:
+            packed = np.frombuffer(base64.b64decode(data["bits"]), dtype=np.uint8)
+            n = min(int(data.get("n", 0)), total_words)
+            keep = np.ones(total_words, dtype=bool)
+            keep[:n] = np.unpackbits(packed, count=n).astype(bool)
+            return cls(media_id, keep, data.get("kind", "mask-v2"))
+
+        keep = np.ones(total_words, dtype=bool)
+        removed = data.get("remove", [])
+        if removed:
+            # +1 at each range start, -1 at each end: a running sum > 0 marks
+            # words inside at least one removed range.
+            ranges = np.clip(np.asarray(removed, dtype=np.int64), 0, total_words)
+            marks = np.zeros(total_words + 1, dtype=np.int32)
+            np.add.at(marks, ranges[:, 0], 1)
+            np.add.at(marks, ranges[:, 1], -1)
+            keep = np.cumsum(marks[:-1]) == 0
         return cls(media_id, keep, data.get("kind", "mask-v1"))
\ No newline at end of file
@@ -2,7 +2,9 @@
 """
 Utilities for formatting transcription data.
 """
+import itertools
 import logging
+import operator
 import typing as t
 from typing import List, Dict
 
@@ -10,7 +12,11 @@ from typing import List, Dict
 logger = logging.getLogger(__name__)
 
 
-def segments_to_markdown(segments: List[Dict], speaker_map: Dict[str, str] = None) -> str:
+def segments_to_markdown(
+    segments: List[Dict],
+    speaker_map: Dict[str, str] = None,
+    presorted: bool = False,
+) -> str:
     """
     Converts a list of transcription segments into a speaker-aware Markdown string.
 
@@ -29,6 +35,9 @@ def segments_to_markdown(segments: List[Dict], speaker_map: Dict[str, str] = Non
                                                to friendly names. If provided, the
                                                friendly names will be used in the
                                                output instead of raw speaker IDs.
+        presorted (bool, optional): Set by callers that already hold segments in
+                                    chronological order to skip the ordering
+                                    check and sort entirely.
 
     Returns:
         str: A Markdown-formatted string representing the transcript with
@@ -40,11 +49,13 @@ def segments_to_markdown(segments: List[Dict], speaker_map: Dict[str, str] = Non
         logger.warning("segments_to_markdown called with empty segment list.")
         return ""
     
-    # Convert Pydantic models to dictionaries if needed
+    # Convert Pydantic models to dictionaries if needed. Word lists are never
+    # read here, so leave them out rather than deep-copying every Word.
     if segments and not isinstance(segments[0], dict):
         try:
-            segments = [s.model_dump() for s in segments]
-            logger.debug("Converted Pydantic models to dictionaries for formatting")
+            segments = [s.model_dump(exclude={"words"}) for s in segments]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Converted Pydantic models to dictionaries for formatting")
         except AttributeError:
             logger.warning("Segments appear to be non-dict objects without model_dump method")
 
@@ -52,62 +63,39 @@ def segments_to_markdown(segments: List[Dict], speaker_map: Dict[str, str] = Non
 
     # Sort segments by start time to ensure chronological order.
     # This is crucial for correctly merging consecutive utterances.
+    # WhisperX already emits segments in order, so a linear check usually
+    # lets us skip the O(N log N) sort and its copy.
     try:
-        segments = sorted(segments, key=lambda s: s["start"])
+        if not presorted:
+            starts = [s["start"] for s in segments]
+            if any(a > b for a, b in zip(starts, starts[1:])):
+                segments = sorted(segments, key=operator.itemgetter("start"))
     except KeyError:
         logger.error("Segments missing 'start' key, cannot sort for formatting.")
         # Fallback: attempt to process without sorting, results may be incorrect.
         pass # Or raise an error depending on desired strictness
 
-    output_paragraphs = [] # Stores the final formatted paragraphs
-    current_buffer = []    # Temporarily holds text pieces for the current speaker
-    current_speaker = None # Tracks the speaker of the current buffer
-
-    def flush_buffer():
-        """
-        Flushes the content of the current_buffer into the output_paragraphs list.
-        Formats the text with the current speaker's ID. Clears the buffer afterwards.
-        """
-        # nonlocal current_speaker, current_buffer, output_paragraphs # Not strictly needed but clarifies intent
-        if current_buffer:
-            # Join collected text pieces, strip surrounding whitespace
-            joined_text = " ".join(current_buffer).strip()
-            # Get speaker label from speaker_map if available, otherwise use raw speaker ID
-            speaker_label = speaker_map.get(current_speaker, current_speaker) if speaker_map else current_speaker
-            # Format the paragraph with speaker ID in bold Markdown
-            formatted_paragraph = f"**{speaker_label}:** {joined_text}"
-            output_paragraphs.append(formatted_paragraph)
-            # Clear the buffer for the next speaker turn
-            current_buffer.clear()
-            logger.debug(f"Flushed buffer for {current_speaker}, added paragraph.")
-
-    # Iterate through each sorted segment
-    for i, seg in enumerate(segments):
-        # Get speaker, default to 'SPEAKER_UNKNOWN' if missing
-        speaker = seg.get("speaker", "SPEAKER_UNKNOWN")
-        # Get text, default to empty string, strip whitespace
-        text = seg.get("text", "").strip()
-
-        # If the speaker changes OR it's the very first segment, flush the previous buffer
-        # and update the current speaker.
-        if speaker != current_speaker:
-            # Don't flush if it's the *very first* segment and buffer is empty
-            # Ensures flush isn't called unnecessarily at start
-            if i > 0 or current_buffer:
-                 flush_buffer()
-            current_speaker = speaker
-            logger.debug(f"Speaker changed to {current_speaker} at segment {i}")
-
-        # Append the current segment's text to the buffer if it's not empty
-        if text:
-            current_buffer.append(text)
-
-    # After the loop finishes, flush any remaining text in the buffer
-    # (this handles the very last speaker turn)
-    flush_buffer()
+    # Merge consecutive segments from the same speaker into one paragraph.
+    # Single-speaker transcripts (e.g. no diarization) are one paragraph, so
+    # grouping is skipped for them. Speaker turns whose segments carry no
+    # text produce no paragraph.
+    speakers = {s.get("speaker", "SPEAKER_UNKNOWN") for s in segments}
+    if len(speakers) == 1:
+        groups = [(speakers.pop(), segments)]
+    else:
+        groups = itertools.groupby(segments, key=lambda s: s.get("speaker", "SPEAKER_UNKNOWN"))
+
+    output_paragraphs = []
+    for speaker, group in groups:
+        texts = [text for text in (s.get("text", "").strip() for s in group) if text]
+        if not texts:
+            continue
+        # Get speaker label from speaker_map if available, otherwise use raw speaker ID
+        speaker_label = speaker_map.get(speaker, speaker) if speaker_map else speaker
+        output_paragraphs.append(f"**{speaker_label}:** {' '.join(texts)}")
 
     logger.info(f"Formatting complete. Generated {len(output_paragraphs)} paragraphs.")
 
     # Join all formatted paragraphs with double newlines for Markdown compatibility
     final_markdown = "\n\n".join(output_paragraphs)
-    return final_markdown 
\ No newline at end of file
+    return final_markdown 
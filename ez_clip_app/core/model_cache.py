@@ -1,41 +1,81 @@
 """
 Singleton model loaders for WhisperX and PyAnnote.
 """
-import torch
+import contextlib
+import queue
+import threading
 import logging
-from ez_clip_app.config import DEFAULT_MODEL_SIZE, DEVICE, HF_TOKEN
+import typing as t
+from functools import lru_cache
+from ez_clip_app.config import (
+    DEFAULT_MODEL_SIZE, DEFAULT_LANGUAGE, DEVICE, HF_TOKEN, DIARIZATION_BATCH_SIZE, COMPUTE_TYPE,
+    TRANSCRIBE_WORKERS
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Cache for loaded models
+# Cache for loaded models (WhisperX: a pool of pipelines per model size)
 _WHISPER_MODELS = {}
 _DIARIZATION_MODELS = {}
 
-def get_whisper(model_size=DEFAULT_MODEL_SIZE):
-    """Get or load WhisperX model.
+# Guards model loading so concurrent workers never load the same model twice
+_LOCK = threading.Lock()
+
+def get_whisper_pool(model_size=DEFAULT_MODEL_SIZE) -> queue.Queue:
+    """Get or load the pool of WhisperX pipelines for *model_size*.
+    
+    ``FasterWhisperPipeline.transcribe`` stores per-call state (tokenizer,
+    options) on the pipeline, so one pipeline must never serve two threads
+    at once. The pool holds TRANSCRIBE_WORKERS pipelines that all wrap one
+    CTranslate2 model loaded with ``num_workers=TRANSCRIBE_WORKERS``: the
+    weights are held once and concurrent ``generate`` calls really run in
+    parallel. Check pipelines out with :func:`whisper_pipeline`.
     
     Args:
         model_size: Model size ('tiny', 'base', 'small', 'medium', 'large-v1', 'large-v2', 'turbo')
         
     Returns:
-        Loaded WhisperX model
+        Queue of idle pipelines
     """
-    if model_size not in _WHISPER_MODELS:
+    if model_size in _WHISPER_MODELS:
+        return _WHISPER_MODELS[model_size]
+    
+    with _LOCK:
+        if model_size in _WHISPER_MODELS:
+            return _WHISPER_MODELS[model_size]
         try:
             import whisperx
+            from whisperx.asr import WhisperModel
             logger.info(f"Loading WhisperX {model_size} model...")
             
-            # Use CUDA if available, otherwise use CPU
-            device = DEVICE
-            compute_type = "float16" if device == "cuda" else "float32"
-            
-            # Load the model
-            _WHISPER_MODELS[model_size] = whisperx.load_model(
-                model_size, 
-                device=device,
-                compute_type=compute_type
+            # Load the model (int8 on CPU halves weight bandwidth vs float32).
+            # It must be whisperx's subclass: the pipeline calls its
+            # generate_segment_batched, which plain faster-whisper lacks
+            model = WhisperModel(
+                model_size,
+                device=DEVICE,
+                compute_type=COMPUTE_TYPE,
+                num_workers=TRANSCRIBE_WORKERS
             )
+            pool = queue.Queue()
+            first = whisperx.load_model(
+                model_size,
+                device=DEVICE,
+                compute_type=COMPUTE_TYPE,
+                model=model
+            )
+            pool.put(first)
+            # Further pipelines share the model and the VAD model
+            for _ in range(TRANSCRIBE_WORKERS - 1):
+                pool.put(whisperx.load_model(
+                    model_size,
+                    device=DEVICE,
+                    compute_type=COMPUTE_TYPE,
+                    model=model,
+                    vad_model=first.vad_model
+                ))
+            _WHISPER_MODELS[model_size] = pool
             logger.info(f"WhisperX {model_size} model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading WhisperX model: {e}")
@@ -43,14 +83,42 @@ def get_whisper(model_size=DEFAULT_MODEL_SIZE):
     
     return _WHISPER_MODELS[model_size]
 
+@contextlib.contextmanager
+def whisper_pipeline(model_size=DEFAULT_MODEL_SIZE) -> t.Iterator[t.Any]:
+    """Check a WhisperX pipeline out of the pool for exclusive use.
+    
+    Blocks until a pipeline is idle.
+    
+    Args:
+        model_size: Model size, see :func:`get_whisper_pool`
+    
+    Yields:
+        WhisperX pipeline
+    """
+    pool = get_whisper_pool(model_size)
+    pipeline = pool.get()
+    try:
+        yield pipeline
+    finally:
+        pool.put(pipeline)
+
 def get_diarization_model():
     """Get or load PyAnnote diarization model.
     
+    The pipeline stays resident (on GPU when enabled) for the lifetime of the
+    process and is shared by all workers.
+    
     Returns:
         Loaded diarization pipeline
     """
-    if not _DIARIZATION_MODELS.get("diarize"):
+    if "diarize" in _DIARIZATION_MODELS:
+        return _DIARIZATION_MODELS["diarize"]
+    
+    with _LOCK:
+        if "diarize" in _DIARIZATION_MODELS:
+            return _DIARIZATION_MODELS["diarize"]
         try:
+            import torch
             from pyannote.audio import Pipeline
             
             if not HF_TOKEN:
@@ -66,6 +134,11 @@ def get_diarization_model():
             if DEVICE == "cuda" and torch.cuda.is_available():
                 pipeline = pipeline.to(torch.device("cuda"))
             
+            # Larger inference batches keep the GPU busy between chunks
+            for attr in ("segmentation_batch_size", "embedding_batch_size"):
+                if hasattr(pipeline, attr):
+                    setattr(pipeline, attr, DIARIZATION_BATCH_SIZE)
+            
             _DIARIZATION_MODELS["diarize"] = pipeline
             logger.info("Diarization model loaded successfully")
         except Exception as e:
@@ -74,25 +147,48 @@ def get_diarization_model():
     
     return _DIARIZATION_MODELS["diarize"]
 
-def get_alignment_model():
-    """Get or load WhisperX alignment model.
+def get_alignment_model(language_code: str = DEFAULT_LANGUAGE):
+    """Get or load WhisperX alignment model for a language.
+    
+    Args:
+        language_code: ISO language code of the transcript
     
     Returns:
-        Loaded alignment model
+        Tuple of (alignment model, metadata)
     """
-    if not _DIARIZATION_MODELS.get("align"):
-        try:
-            import whisperx
-            
-            logger.info("Loading alignment model...")
-            model_a, metadata = whisperx.load_align_model(
-                language_code="en",
-                device=DEVICE
-            )
-            _DIARIZATION_MODELS["align"] = (model_a, metadata)
-            logger.info("Alignment model loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading alignment model: {e}")
-            raise
+    with _LOCK:
+        return _load_alignment_model(language_code)
+
+@lru_cache(maxsize=8)
+def _load_alignment_model(language_code: str):
+    """Load the alignment model for *language_code* (cached per language)."""
+    try:
+        import whisperx
+        
+        logger.info(f"Loading alignment model for {language_code}...")
+        model_a, metadata = whisperx.load_align_model(
+            language_code=language_code,
+            device=DEVICE
+        )
+        logger.info(f"Alignment model for {language_code} loaded successfully")
+        return model_a, metadata
+    except Exception as e:
+        logger.error(f"Error loading alignment model for {language_code}: {e}")
+        raise
+
+def alignment_autocast():
+    """Context manager that runs alignment forward passes in FP16 on GPU.
     
-    return _DIARIZATION_MODELS["align"]
\ No newline at end of file
+    wav2vec2 alignment is compute-bound on the GPU and loses nothing
+    measurable at half precision. The weights stay FP32, so the FP32
+    waveform whisperx feeds in needs no cast; on CPU this is a no-op.
+    
+    Returns:
+        Autocast context on CUDA, otherwise a null context
+    """
+    if DEVICE != "cuda":
+        return contextlib.nullcontext()
+    import torch
+    if not torch.cuda.is_available():
+        return contextlib.nullcontext()
+    return torch.autocast(device_type="cuda", dtype=torch.float16)
@@ -0,0 +1,151 @@
+"""
+Long-lived model server that keeps WhisperX and PyAnnote resident across processes.
+
+Start it once with ``python -m ez_clip_app.core.model_server``. Short-lived app
+processes find its Unix socket and send transcription/diarization work to it
+instead of loading the models themselves. If no server is running they fall
+back to loading the models in-process.
+"""
+import logging
+import os
+import secrets
+import typing as t
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import BaseManager, RemoteError
+
+from ez_clip_app.config import (
+    MODEL_SERVER_SOCKET, MODEL_SERVER_AUTHKEY, MODEL_SERVER_AUTHKEY_FILE
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Errors of the connection to the server, as opposed to errors raised by the
+# work itself (which the proxy re-raises as-is). Only these justify falling
+# back to in-process models.
+TRANSPORT_ERRORS = (ConnectionError, EOFError, RemoteError)
+
+
+def _authkey() -> bytes:
+    """Return the shared secret for the server socket.
+    
+    Uses ``EZCLIP_MODEL_AUTHKEY`` if set, otherwise the key file, creating
+    it with a random key (readable by the owner only) on first use.
+    """
+    if MODEL_SERVER_AUTHKEY:
+        return MODEL_SERVER_AUTHKEY.encode()
+    try:
+        fd = os.open(MODEL_SERVER_AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return MODEL_SERVER_AUTHKEY_FILE.read_bytes().strip()
+    key = secrets.token_hex(32).encode()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+class ModelService:
+    """Server-side object whose methods run on the resident models."""
+
+    def transcribe(self, audio: t.Any, **kwargs) -> t.Any:
+        """Transcribe *audio* in the server process.
+
+        Args:
+            audio: Audio file path or waveform from ``transcribe.extract_audio``
+            **kwargs: Forwarded to ``transcribe.transcribe``
+
+        Returns:
+            TranscriptionResult
+        """
+        from ez_clip_app.core import transcribe
+        return transcribe.transcribe_local(audio, **kwargs)
+
+    def diarize(self, audio: t.Any, segments: t.List[dict], **kwargs) -> t.List[dict]:
+        """Diarize *segments* of *audio* in the server process.
+
+        Args:
+            audio: Audio file path or waveform from ``transcribe.extract_audio``
+            segments: Transcription segments from WhisperX
+            **kwargs: Forwarded to ``diarize.diarize``
+
+        Returns:
+            Segments with speaker labels
+        """
+        from ez_clip_app.core import diarize
+        return diarize.diarize_local(audio, segments, **kwargs)
+
+    def diarize_audio(self, audio: t.Any, **kwargs) -> t.Any:
+        """Compute speaker turns for *audio* in the server process.
+
+        Args:
+            audio: Audio file path or waveform from ``transcribe.extract_audio``
+            **kwargs: Forwarded to ``diarize.diarize_audio_local``
+
+        Returns:
+            ``(starts, ends, speakers)`` arrays
+        """
+        from ez_clip_app.core import diarize
+        return diarize.diarize_audio_local(audio, **kwargs)
+
+
+class ModelManager(BaseManager):
+    """Manager that exposes a single shared :class:`ModelService`."""
+
+
+_SERVICE = ModelService()
+
+
+def _get_service() -> ModelService:
+    """Return the process-wide service instance (server side)."""
+    return _SERVICE
+
+
+ModelManager.register("models", callable=_get_service)
+
+
+def connect() -> t.Optional[ModelService]:
+    """Connect to a running model server.
+
+    Returns:
+        Proxy to the server's ModelService, or None if no server is reachable
+    """
+    if os.name != "posix" or not MODEL_SERVER_SOCKET.exists():
+        return None
+    try:
+        manager = ModelManager(address=str(MODEL_SERVER_SOCKET), authkey=_authkey())
+        manager.connect()
+        return manager.models()
+    except (OSError, EOFError, AuthenticationError, RemoteError) as e:
+        logger.warning(f"Model server socket present but unreachable: {e}")
+        return None
+
+
+def serve() -> None:
+    """Load all models and serve requests until interrupted."""
+    from ez_clip_app.core import model_cache
+
+    logger.info("Preloading models for model server...")
+    model_cache.get_whisper_pool()
+    model_cache.get_diarization_model()
+    model_cache.get_alignment_model()
+
+    # A stale socket from a previous run would make bind() fail
+    if MODEL_SERVER_SOCKET.exists():
+        MODEL_SERVER_SOCKET.unlink()
+
+    manager = ModelManager(address=str(MODEL_SERVER_SOCKET), authkey=_authkey())
+    server = manager.get_server()
+    logger.info(f"Model server listening on {MODEL_SERVER_SOCKET}")
+    try:
+        server.serve_forever()
+    finally:
+        if MODEL_SERVER_SOCKET.exists():
+            MODEL_SERVER_SOCKET.unlink()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    serve()
@@ -4,8 +4,10 @@ Pipeline orchestration for the WhisperX transcription app.
 import logging
 import os
 import tempfile
+import time
 import dataclasses
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ez_clip_app.config import Status
@@ -34,6 +36,42 @@ class PipelineError(Exception):
     pass
 
 
+class _ThrottledProgress:
+    """Rate-limit progress writes to the database.
+    
+    Model callbacks can fire hundreds of times per job; only a change of at
+    least ``min_delta`` percent, or one arriving ``min_interval`` seconds
+    after the last write, reaches SQLite.
+    """
+    
+    def __init__(self, db: DB, job_id: int, min_delta: float = 1.0, min_interval: float = 0.25):
+        self.db = db
+        self.job_id = job_id
+        self.min_delta = min_delta
+        self.min_interval = min_interval
+        self.last_value = None
+        self.last_time = 0.0
+    
+    def update(self, value: float, force: bool = False):
+        """Write *value* unless it is too close to the last written one.
+        
+        Args:
+            value: Progress percentage (0-100)
+            force: Write regardless of the throttle (used for milestones)
+        """
+        now = time.monotonic()
+        if not force:
+            if value == self.last_value:
+                return
+            if (self.last_value is not None
+                    and abs(value - self.last_value) < self.min_delta
+                    and now - self.last_time < self.min_interval):
+                return
+        self.db.update_progress(self.job_id, value)
+        self.last_value = value
+        self.last_time = now
+
+
 def process_file(
     media_path: t.Union[str, Path],
     settings: JobSettings,
@@ -54,10 +92,11 @@ def process_file(
     Raises:
         PipelineError: If processing fails
     """
-    media_path = Path(media_path)
+    # Normalise once; everything downstream takes the string form
+    media_path = str(Path(media_path))
     
     # Validate file exists
-    if not media_path.exists():
+    if not os.path.exists(media_path):
         raise PipelineError(f"File not found: {media_path}")
     
     # Set HF token if provided
@@ -68,21 +107,32 @@ def process_file(
     job_id = db.insert_media(media_path)
     logger.info(f"Starting job {job_id} for {media_path}")
     
-    # Track temporary files for cleanup
-    temp_files = []
+    # Coalesce per-tick progress writes
+    throttle = _ThrottledProgress(db, job_id)
+    
+    # Diarization only needs the audio, so it runs alongside transcription
+    diarize_pool = ThreadPoolExecutor(max_workers=1) if settings.diarize else None
     
     try:
         # Update status to running
         db.set_status(job_id, Status.RUNNING)
         
-        # Extract audio
-        audio_path = transcribe.extract_audio(media_path)
-        temp_files.append(audio_path)
+        # Extract audio (decoded straight into memory)
+        audio = transcribe.extract_audio(media_path)
         
         # Update progress
         if progress_cb:
             progress_cb(5)
-            db.update_progress(job_id, 5)
+            throttle.update(5, force=True)
+        
+        # Start diarization in the background
+        if diarize_pool:
+            turns_future = diarize_pool.submit(
+                diarize.diarize_audio,
+                audio,
+                min_speakers=settings.min_speakers,
+                max_speakers=settings.max_speakers
+            )
         
         # Transcribe audio
         def transcribe_progress(p):
@@ -90,10 +140,10 @@ def process_file(
             scaled = 5 + (p * 0.6)
             if progress_cb:
                 progress_cb(scaled)
-                db.update_progress(job_id, scaled)
+                throttle.update(scaled)
         
         transcription = transcribe.transcribe(
-            audio_path,
+            audio,
             model_size=settings.model_size,
             language=settings.language,
             progress_callback=transcribe_progress
@@ -102,7 +152,7 @@ def process_file(
         # Update progress
         if progress_cb:
             progress_cb(65)
-            db.update_progress(job_id, 65)
+            throttle.update(65, force=True)
         
         # Perform diarization or use single speaker
         try:
@@ -112,14 +162,16 @@ def process_file(
                     scaled = 65 + (p * 0.25)
                     if progress_cb:
                         progress_cb(scaled)
-                        db.update_progress(job_id, scaled)
+                        throttle.update(scaled)
                 
+                # Join the background diarization, then label the segments
                 segments = diarize.diarize(
-                    audio_path,
+                    audio,
                     transcription.segments,
                     min_speakers=settings.min_speakers,
                     max_speakers=settings.max_speakers,
-                    progress_callback=diarize_progress
+                    progress_callback=diarize_progress,
+                    turns=turns_future.result()
                 )
             else:
                 segments = diarize.merge_into_single_speaker(transcription.segments)
@@ -132,7 +184,7 @@ def process_file(
         # Update progress
         if progress_cb:
             progress_cb(90)
-            db.update_progress(job_id, 90)
+            throttle.update(90, force=True)
         
         # Ensure segments are sorted by start time
         segments.sort(key=lambda s: s["start"])
@@ -141,7 +193,7 @@ def process_file(
         speaker_map = db.get_speaker_map(job_id)
         
         # Format the segments into a speaker-aware Markdown string with speaker mapping
-        formatted_full_text = segments_to_markdown(segments, speaker_map)
+        formatted_full_text = segments_to_markdown(segments, speaker_map, presorted=True)
 
         # Save the formatted transcript and segments to the database
         transcript_id = db.save_transcript(
@@ -157,7 +209,7 @@ def process_file(
         # Final progress update
         if progress_cb:
             progress_cb(100)
-            db.update_progress(job_id, 100)
+            throttle.update(100, force=True)
         
         logger.info(f"Job {job_id} completed successfully")
         return transcript_id
@@ -168,10 +220,9 @@ def process_file(
         raise PipelineError(f"Failed to process {media_path}: {e}")
     
     finally:
-        # Clean up temporary files
-        for temp_path in temp_files:
-            try:
-                if temp_path.exists():
-                    temp_path.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to remove temporary file {temp_path}: {e}")
\ No newline at end of file
+        # A diarization that already started cannot be cancelled; wait for it
+        # so the job (and its MAX_CONCURRENT_JOBS slot) ends only once it
+        # stops using the CPU/GPU. The error is already recorded in the DB.
+        if diarize_pool:
+            diarize_pool.shutdown(wait=True, cancel_futures=True)
+
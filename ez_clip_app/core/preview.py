@@ -1,34 +1,92 @@
 """
 PreviewRebuilder for clip generation and preview.
 
-This module handles creating clip segments and building a playlist for preview
-based on the current edit mask.
+This module stitches the kept ranges of the current edit mask into a single
+preview file that the player loads directly.
 """
+import hashlib
+import os
+import threading
 import weakref
 import logging
 from pathlib import Path
 from typing import List, Tuple
 
 import ffmpeg
-from PySide6.QtCore import QUrl, QTimer
-# In newer PySide6 versions, QMediaPlaylist was removed and playlists are handled differently
-try:
-    from PySide6.QtMultimedia import QMediaPlaylist
-    USE_LEGACY_PLAYLIST = True
-except ImportError:
-    from PySide6.QtCore import QObject
-    USE_LEGACY_PLAYLIST = False
+from PySide6.QtCore import QTimer
 
-from slugify import slugify
+from ez_clip_app.config import PREVIEW_CACHE_DIR, PREVIEW_CACHE_MAX_BYTES
+from ez_clip_app.core.video_edit import concat_ranges
 
 logger = logging.getLogger(__name__)
 
 
+def _preview_name(media_id: int, ranges: List[Tuple[float, float]]) -> str:
+    """Cache file name for the preview of *ranges* of media *media_id*.
+    
+    Keyed on the millisecond ranges, so undoing an edit (or toggling back and
+    forth) hits a preview that was already built.
+    """
+    key = repr((media_id, [(round(s * 1000), round(e * 1000)) for s, e in ranges]))
+    return f"preview_{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}.mp4"
+
+
+def evict_cache(cache_root: Path = PREVIEW_CACHE_DIR, max_bytes: int = PREVIEW_CACHE_MAX_BYTES) -> None:
+    """Delete least-recently-used previews until the cache fits in *max_bytes*.
+    
+    Args:
+        cache_root: Root of the preview cache
+        max_bytes: Size budget for all cached previews
+    """
+    entries = []
+    total = 0
+    for clip in cache_root.glob("*/*.mp4"):
+        # Previews still being rendered are not cache entries yet
+        if clip.name.startswith("partial_"):
+            continue
+        try:
+            st = clip.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, clip))
+        total += st.st_size
+    
+    if total <= max_bytes:
+        return
+    
+    # Oldest first; reused previews get their mtime bumped in _build
+    entries.sort()
+    for _, size, clip in entries:
+        try:
+            clip.unlink()
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+    logger.info(f"Preview cache trimmed to {total / 1e6:.0f} MB")
+
+
+class PreviewHandle:
+    """Handle to a scheduled preview build.
+    
+    Cancelling it drops the build if it has not started yet.
+    """
+    __slots__ = ("cancelled",)
+    
+    def __init__(self):
+        self.cancelled = False
+    
+    def cancel(self) -> None:
+        """Skip the build this handle refers to."""
+        self.cancelled = True
+
+
 class PreviewRebuilder:
     """Manages preview clip generation and playback.
     
-    Takes an EditMask and generates temporary clips for each kept segment,
-    then builds a QMediaPlaylist for preview.
+    Takes an EditMask and stitches every kept segment into one cached
+    preview file with a single ffmpeg concat-demuxer run.
     """
     
     def __init__(self, player_widget):
@@ -39,8 +97,12 @@ class PreviewRebuilder:
         """
         # Keep weak reference to avoid circular references
         self.player = weakref.ref(player_widget)
-        self._timer = None
         self._scheduled_build = None
+        
+        # One reusable single-shot timer; start() on an active timer restarts it
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._build)
     
     def schedule(self, mask, words, media_path):
         """Schedule a preview rebuild after a short delay.
@@ -51,30 +113,31 @@ class PreviewRebuilder:
             mask: The EditMask to use for building ranges
             words: List of Word objects to build ranges from
             media_path: Path to the source media file
+            
+        Returns:
+            PreviewHandle that cancels this build
         """
-        # Cancel any existing timer
-        if self._timer and self._timer.isActive():
-            self._timer.stop()
+        # Store parameters for later (the latest call wins)
+        handle = PreviewHandle()
+        self._scheduled_build = (handle, mask, words, media_path)
         
-        # Store parameters for later
-        self._scheduled_build = (mask, words, media_path)
-        
-        # Create new timer
-        self._timer = QTimer()
-        self._timer.setSingleShot(True)
-        self._timer.timeout.connect(self._build)
+        # (Re)start the debounce window
         self._timer.start(300)  # 300ms debounce
+        return handle
     
     def _build(self):
-        """Build preview clips and playlist.
+        """Build the preview file and load it into the player.
         
-        Uses the scheduled parameters to build ranges, extract clips,
-        and create a playlist for preview.
+        Uses the scheduled parameters to build ranges and stitch them into
+        a single preview (reused from the cache when unchanged).
         """
         if not self._scheduled_build:
             return
             
-        mask, words, media_path = self._scheduled_build
+        handle, mask, words, media_path = self._scheduled_build
+        self._scheduled_build = None
+        if handle.cancelled:
+            return
         
         # Get player widget (might be gone if UI was closed)
         player = self.player()
@@ -90,51 +153,38 @@ class PreviewRebuilder:
             return
             
         # Create cache folder
-        cache_dir = Path.home() / ".ez_clip_app" / "cache" / str(mask.media_id)
+        cache_dir = PREVIEW_CACHE_DIR / str(mask.media_id)
         cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate clips for each range
-        clips = []
-        for idx, (start, end) in enumerate(ranges):
-            out_file = cache_dir / f"{idx:03d}.mp4"
-            clips.append(out_file)
-            
-            # Skip if clip already exists
-            if out_file.exists():
-                continue
-                
+        preview_file = cache_dir / _preview_name(mask.media_id, ranges)
+        if preview_file.exists():
+            # Bump mtime so LRU eviction keeps it
+            os.utime(preview_file)
+        elif ranges:
+            # Render under a temporary name and move it into place only once
+            # complete, so a failed run never leaves a truncated cache hit
+            partial = cache_dir / f"partial_{preview_file.name}"
             try:
-                # Extract clip with copy codec (no re-encode)
-                logger.info(f"Extracting clip {idx} [{start:.2f}-{end:.2f}]")
-                (
-                    ffmpeg
-                    .input(str(media_path), ss=start, to=end)
-                    .output(str(out_file), c="copy")
-                    .overwrite_output()
-                    .run(quiet=True)
-                )
-            except ffmpeg.Error as e:
+                # One stream-copy pass over all kept ranges (no re-encode)
+                logger.info(f"Building preview from {len(ranges)} ranges")
+                concat_ranges(Path(media_path), ranges, partial)
+                os.replace(partial, preview_file)
+            except (ffmpeg.Error, OSError) as e:
                 logger.error(f"FFmpeg error: {e}")
+                partial.unlink(missing_ok=True)
+                return
+        else:
+            return
+        
+        # Keep the cache bounded without blocking the UI thread
+        threading.Thread(target=evict_cache, daemon=True).start()
         
         player = self.player()
         if player is None:
             return
-            
-        if USE_LEGACY_PLAYLIST:
-            # Use legacy QMediaPlaylist
-            playlist = QMediaPlaylist()
-            for clip in clips:
-                playlist.addMedia(QUrl.fromLocalFile(str(clip)))
-            
-            # Set playlist to player and reset position
-            player.player.setPlaylist(playlist)
-        else:
-            # In newer versions, we need to handle playlists differently
-            if clips:
-                # Just load the first clip for now
-                # For a complete solution, we'd need to implement playlist management at the MainWindow level
-                player.load(clips[0])
-                logger.info(f"Loaded first clip: {clips[0]}")
+        
+        player.load(preview_file)
+        logger.info(f"Loaded preview: {preview_file}")
         
         player.player.setPosition(0)
-        player.player.pause()
\ No newline at end of file
+        player.player.pause()
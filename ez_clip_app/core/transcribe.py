@@ -2,66 +2,213 @@
 WhisperX wrapper for transcription with word-level timestamps.
 """
 import logging
+import operator
+import os
+import re
 import typing as t
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import ffmpeg
-import tempfile
-import whisperx
+import numpy as np
 
-from ez_clip_app.core import model_cache
-from ez_clip_app.config import DEFAULT_MODEL_SIZE, DEFAULT_LANGUAGE, DEVICE
+from ez_clip_app.core import model_cache, model_server
+from ez_clip_app.config import (
+    DEFAULT_MODEL_SIZE, DEFAULT_LANGUAGE, DEVICE, SAMPLE_RATE,
+    TRANSCRIBE_WORKERS, TRANSCRIBE_CHUNK_SEC
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True, frozen=True)
 class TranscriptionResult:
     """Container for transcription results."""
-    
-    def __init__(self, segments, full_text, duration):
-        self.segments = segments
-        self.full_text = full_text
-        self.duration = duration
+    segments: t.List[dict]
+    full_text: str
+    duration: float
+
+
+# Audio input: a file path, or a float32 waveform from extract_audio()
+Audio = t.Union[str, Path, np.ndarray]
 
 
-def extract_audio(media_path: t.Union[str, Path]) -> Path:
+def extract_audio(media_path: t.Union[str, Path]) -> np.ndarray:
     """Extract audio from media file using ffmpeg.
     
+    FFmpeg writes 16 kHz mono PCM to a pipe, so the audio never round-trips
+    through a temporary WAV on disk.
+    
     Args:
         media_path: Path to media file
         
     Returns:
-        Path to extracted audio file (WAV)
+        Float32 waveform in [-1, 1] sampled at SAMPLE_RATE
     """
-    media_path = Path(media_path)
-    # Create temporary file with .wav extension
-    temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-    temp_path = Path(temp_file.name)
-    temp_file.close()
-    
     try:
         logger.info(f"Extracting audio from {media_path}")
         
-        # Use ffmpeg to extract audio
-        (
+        # Use ffmpeg to decode audio to raw samples on stdout
+        out, _ = (
             ffmpeg
-            .input(str(media_path))
-            .output(str(temp_path), acodec='pcm_s16le', ar='16000', ac=1)
-            .overwrite_output()
+            .input(os.fspath(media_path))
+            .output("pipe:", format="s16le", acodec="pcm_s16le", ar=str(SAMPLE_RATE), ac=1)
             .run(capture_stdout=True, capture_stderr=True)
         )
         
-        logger.info(f"Audio extracted to {temp_path}")
-        return temp_path
+        audio = np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+        logger.info(f"Audio extracted: {len(audio) / SAMPLE_RATE:.1f} s")
+        return audio
     
     except ffmpeg.Error as e:
         logger.error(f"Error extracting audio: {e.stderr.decode()}")
-        if temp_path.exists():
-            temp_path.unlink()
         raise
 
 
+def _describe(audio: Audio) -> str:
+    """Short description of *audio* for log messages."""
+    if isinstance(audio, np.ndarray):
+        return f"{len(audio) / SAMPLE_RATE:.1f} s of audio"
+    return str(audio)
+
+
+_SILENCE_RE = re.compile(r"silence_(start|end): (-?[\d.]+)")
+
+
+def _chunks_from_silences(
+    silences: t.List[t.Tuple[float, float]],
+    duration: float,
+    min_chunk_sec: float = TRANSCRIBE_CHUNK_SEC
+) -> t.List[t.Tuple[float, float]]:
+    """Turn detected silences into contiguous ``(start, end)`` chunks.
+
+    Chunks are cut at the midpoint of the first silence after a chunk has
+    grown to at least *min_chunk_sec*, so no chunk boundary falls inside speech.
+
+    Args:
+        silences: ``(silence_start, silence_end)`` pairs in seconds
+        duration: Total audio duration in seconds
+        min_chunk_sec: Minimum chunk length in seconds
+
+    Returns:
+        List of ``(start, end)`` tuples covering ``[0, duration]``
+    """
+    chunks = []
+    chunk_start = 0.0
+    for sil_start, sil_end in silences:
+        cut = (sil_start + sil_end) / 2
+        if cut - chunk_start >= min_chunk_sec and cut < duration:
+            chunks.append((chunk_start, cut))
+            chunk_start = cut
+    chunks.append((chunk_start, duration))
+    return chunks
+
+
+def _split_on_silence(
+    audio: np.ndarray,
+    min_chunk_sec: float = TRANSCRIBE_CHUNK_SEC,
+    noise_db: int = -35,
+    min_silence_sec: float = 0.5
+) -> t.List[t.Tuple[float, float]]:
+    """Split audio into chunks at silences detected by ffmpeg ``silencedetect``.
+
+    Args:
+        audio: Float32 waveform sampled at SAMPLE_RATE
+        min_chunk_sec: Minimum chunk length in seconds
+        noise_db: Noise floor below which audio counts as silence
+        min_silence_sec: Minimum silence length to report
+
+    Returns:
+        List of ``(start, end)`` tuples covering the whole file
+    """
+    _, err = (
+        ffmpeg
+        .input("pipe:", format="f32le", ar=str(SAMPLE_RATE), ac=1)
+        .filter("silencedetect", noise=f"{noise_db}dB", d=min_silence_sec)
+        .output("-", format="null")
+        .run(input=audio.astype(np.float32, copy=False).tobytes(),
+             capture_stdout=True, capture_stderr=True)
+    )
+
+    silences = []
+    pending_start = None
+    for kind, value in _SILENCE_RE.findall(err.decode(errors="replace")):
+        if kind == "start":
+            pending_start = float(value)
+        elif pending_start is not None:
+            silences.append((pending_start, float(value)))
+            pending_start = None
+
+    return _chunks_from_silences(silences, len(audio) / SAMPLE_RATE, min_chunk_sec)
+
+
+def _transcribe_chunked(
+    model_size: str,
+    audio: np.ndarray,
+    language: str,
+    batch_size: int,
+    workers: int,
+    progress_callback: t.Callable[[float], None] = None
+) -> t.Optional[dict]:
+    """Transcribe silence-delimited chunks of *audio* concurrently.
+
+    Each chunk runs on its own pipeline checked out of the model cache's
+    pool, so concurrent chunks never share per-call pipeline state.
+    
+    Args:
+        model_size: WhisperX model size
+        audio: Float32 waveform sampled at SAMPLE_RATE
+        language: Language code (or 'auto' for auto-detection)
+        batch_size: Batch size for processing
+        workers: Number of chunks transcribed at once
+        progress_callback: Optional callback, scaled from 5 to 30
+
+    Returns:
+        WhisperX-style result with offset-adjusted segments, or None if the
+        audio is too short to be worth splitting
+    """
+    if len(audio) / SAMPLE_RATE < 2 * TRANSCRIBE_CHUNK_SEC:
+        return None
+
+    chunks = _split_on_silence(audio)
+    if len(chunks) < 2:
+        return None
+    logger.info(f"Transcribing {len(chunks)} chunks with {workers} workers")
+
+    def run_chunk(start: float, end: float) -> dict:
+        piece = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+        with model_cache.whisper_pipeline(model_size) as model:
+            return model.transcribe(piece, language=language, batch_size=batch_size)
+
+    results: t.List[t.Optional[dict]] = [None] * len(chunks)
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_chunk, start, end): i
+            for i, (start, end) in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            done += 1
+            if progress_callback:
+                progress_callback(5 + 25 * done / len(chunks))
+
+    # Stitch chunk segments back onto the full-audio timeline
+    segments = []
+    for (offset, _), chunk_result in zip(chunks, results):
+        for seg in chunk_result["segments"]:
+            seg["start"] += offset
+            seg["end"] += offset
+            segments.append(seg)
+
+    return {
+        "segments": segments,
+        "language": results[0].get("language", language),
+    }
+
+
 def transcribe(
-    audio_path: t.Union[str, Path],
+    audio: Audio,
     model_size: str = DEFAULT_MODEL_SIZE,
     language: str = DEFAULT_LANGUAGE,
     batch_size: int = 16,
@@ -69,8 +216,56 @@ def transcribe(
 ) -> TranscriptionResult:
     """Transcribe audio file using WhisperX.
     
+    Uses the resident models of a running model server when one is
+    available, otherwise loads the models in-process.
+    
+    Args:
+        audio: Audio file path or waveform from extract_audio()
+        model_size: WhisperX model size
+        language: Language code (or 'auto' for auto-detection)
+        batch_size: Batch size for processing
+        progress_callback: Optional callback function to report progress (0-100)
+        
+    Returns:
+        TranscriptionResult with segments and full text
+    """
+    remote = model_server.connect()
+    if remote is not None:
+        try:
+            if progress_callback:
+                progress_callback(5)
+            result = remote.transcribe(
+                audio if isinstance(audio, np.ndarray) else str(audio),
+                model_size=model_size,
+                language=language,
+                batch_size=batch_size
+            )
+            if progress_callback:
+                progress_callback(60)
+            return result
+        except model_server.TRANSPORT_ERRORS as e:
+            logger.warning(f"Model server connection failed, running in-process: {e}")
+    
+    return transcribe_local(
+        audio,
+        model_size=model_size,
+        language=language,
+        batch_size=batch_size,
+        progress_callback=progress_callback
+    )
+
+
+def transcribe_local(
+    audio: Audio,
+    model_size: str = DEFAULT_MODEL_SIZE,
+    language: str = DEFAULT_LANGUAGE,
+    batch_size: int = 16,
+    progress_callback: t.Callable[[float], None] = None
+) -> TranscriptionResult:
+    """Transcribe audio file using WhisperX in this process.
+    
     Args:
-        audio_path: Path to audio file
+        audio: Audio file path or waveform from extract_audio()
         model_size: WhisperX model size
         language: Language code (or 'auto' for auto-detection)
         batch_size: Batch size for processing
@@ -79,37 +274,55 @@ def transcribe(
     Returns:
         TranscriptionResult with segments and full text
     """
-    audio_path = Path(audio_path)
-    logger.info(f"Transcribing {audio_path} with {model_size} model")
+    logger.info(f"Transcribing {_describe(audio)} with {model_size} model")
     
     try:
-        # Load WhisperX model
-        model = model_cache.get_whisper(model_size)
+        import whisperx  # deferred: pulls in torch
+        
+        # Decode file paths once; waveforms from extract_audio() are used as-is
+        if not isinstance(audio, np.ndarray):
+            audio = whisperx.load_audio(str(audio))
+        
+        # Load the WhisperX pipelines
+        model_cache.get_whisper_pool(model_size)
         
         # Initial progress update
         if progress_callback:
             progress_callback(5)
         
-        # Transcribe audio
-        result = model.transcribe(
-            str(audio_path),
-            language=language,
-            batch_size=batch_size
-        )
+        # Long audio is split on silences and transcribed in parallel;
+        # short audio (or TRANSCRIBE_WORKERS=1) goes through in one call
+        result = None
+        if TRANSCRIBE_WORKERS > 1:
+            result = _transcribe_chunked(
+                model_size, audio, language, batch_size,
+                TRANSCRIBE_WORKERS, progress_callback
+            )
+        if result is None:
+            with model_cache.whisper_pipeline(model_size) as model:
+                result = model.transcribe(
+                    audio,
+                    language=language,
+                    batch_size=batch_size
+                )
         
         # Progress update after initial transcription
         if progress_callback:
             progress_callback(30)
         
-        # Get word-level alignments
-        alignment_model, metadata = model_cache.get_alignment_model()
-        result = whisperx.align(
-            result["segments"],
-            alignment_model,
-            metadata,
-            str(audio_path),
-            DEVICE
+        # Get word-level alignments in one pass over the full audio
+        alignment_model, metadata = model_cache.get_alignment_model(
+            result.get("language", language)
         )
+        with model_cache.alignment_autocast():
+            result = whisperx.align(
+                result["segments"],
+                alignment_model,
+                metadata,
+                audio,
+                DEVICE,
+                return_char_alignments=False
+            )
         
         # Progress update after alignment
         if progress_callback:
@@ -119,7 +332,8 @@ def transcribe(
         duration = result.get("duration", 0)
         
         # Combine all text
-        full_text = " ".join(segment["text"] for segment in result["segments"])
+        # (map + itemgetter stays in C; join sizes its buffer from the list)
+        full_text = " ".join(map(operator.itemgetter("text"), result["segments"]))
         
         logger.info(f"Transcription completed: {len(result['segments'])} segments")
         
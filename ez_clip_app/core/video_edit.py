@@ -2,20 +2,44 @@
 Thin wrapper around ffmpeg-python for later "Descript-style" edits.
 Only defines interface signatures for now.
 """
+import subprocess
 import ffmpeg
+import numpy as np
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Set, Tuple
+
+from ez_clip_app.config import EXPORT_X264_PRESET, EXPORT_X264_CRF
 
 def extract_clip(src: Path, dst: Path,
-                 start: float, end: float) -> None:
-    """Trim video between timestamps [start, end)."""
-    (
-        ffmpeg
-        .input(str(src), ss=start, to=end)
-        .output(str(dst), c="copy")
-        .overwrite_output()
-        .run(quiet=True)
-    )
+                 start: float, end: float,
+                 reencode: bool = False) -> None:
+    """Trim video between timestamps [start, end).
+
+    ``ss`` is an input option so the demuxer jumps straight to the keyframe
+    at or before *start* via the container index instead of decoding up to
+    it. With stream copy the clip therefore starts on that keyframe; with
+    *reencode* ffmpeg decodes from that keyframe and the clip starts exactly
+    at *start*.
+
+    The argument list is built directly rather than through an
+    ffmpeg-python graph.
+
+    Raises:
+        ffmpeg.Error: If ffmpeg exits with a non-zero status
+    """
+    if reencode:
+        seek, codecs = [], ["-c:v", "libx264", "-c:a", "aac"]
+    else:
+        seek, codecs = ["-noaccurate_seek"], ["-c", "copy"]
+    args = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        *seek, "-ss", f"{start}", "-i", str(src),
+        "-t", f"{end - start}", *codecs, "-avoid_negative_ts", "make_zero",
+        str(dst),
+    ]
+    proc = subprocess.run(args, stdin=subprocess.DEVNULL, capture_output=True)
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", proc.stdout, proc.stderr)
 
 def concat_clips(clips: List[Path], dst: Path) -> None:
     """Simple concat by demux & remux (same codec)."""
@@ -29,4 +53,181 @@ def concat_clips(clips: List[Path], dst: Path) -> None:
         .overwrite_output()
         .run(quiet=True)
     )
-    tmp_list.unlink()
\ No newline at end of file
+    tmp_list.unlink()
+
+def concat_ranges(src: Path, ranges: List[Tuple[float, float]], dst: Path) -> None:
+    """Stitch [start, end) ranges of *src* into *dst* with one ffmpeg run.
+
+    Each range becomes a concat-demuxer entry with ``inpoint``/``outpoint``
+    on the source file, so no intermediate clips are written and only one
+    process is spawned however many ranges there are.
+
+    Raises:
+        ffmpeg.Error: If ffmpeg exits with a non-zero status
+    """
+    # Single quotes inside a quoted concat path are written as '\''
+    quoted = "'" + str(Path(src).absolute()).replace("'", "'\\''") + "'"
+    entries = "".join(
+        f"file {quoted}\ninpoint {start}\noutpoint {end}\n"
+        for start, end in ranges
+    )
+    tmp_list = Path(dst.parent) / f"_{dst.stem}.txt"
+    tmp_list.write_text(entries)
+    try:
+        (
+            ffmpeg
+            .input(str(tmp_list), format="concat", safe=0)
+            .output(str(dst), c="copy")
+            .overwrite_output()
+            .run(quiet=True)
+        )
+    finally:
+        tmp_list.unlink()
+
+
+def stream_types(src: Path) -> Set[str]:
+    """Codec types of the streams in *src* (e.g. ``{"video", "audio"}``).
+
+    Raises:
+        ffmpeg.Error: If ffprobe exits with a non-zero status
+    """
+    args = [
+        "ffprobe", "-v", "error", "-show_entries", "stream=codec_type",
+        "-of", "csv=p=0", str(src),
+    ]
+    proc = subprocess.run(args, stdin=subprocess.DEVNULL, capture_output=True)
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffprobe", proc.stdout, proc.stderr)
+    return set(proc.stdout.decode().split())
+
+def _render_ranges_cmd(src: Path, ranges: List[Tuple[float, float]], dst: Path,
+                       video: bool = True, audio: bool = True) -> List[str]:
+    """ffmpeg command line for :func:`render_ranges`.
+
+    Only the *video* and *audio* streams that exist in *src* are trimmed;
+    the graph of a source without audio would otherwise fail to build.
+    """
+    inp = ffmpeg.input(str(src))
+    parts = []
+    for start, end in ranges:
+        # Every trim reads the same input pads ([0:v]/[0:a]); ffmpeg decodes
+        # each input stream once and fans the frames out to all of them
+        if video:
+            parts.append(inp.video.trim(start=start, end=end).setpts("PTS-STARTPTS"))
+        if audio:
+            parts.append(
+                inp.audio
+                .filter("atrim", start=start, end=end)
+                .filter("asetpts", "PTS-STARTPTS")
+            )
+    joined = ffmpeg.concat(*parts, v=int(video), a=int(audio)).node
+    codecs = {}
+    if video:
+        codecs.update(vcodec="libx264", preset=EXPORT_X264_PRESET, crf=EXPORT_X264_CRF)
+    if audio:
+        codecs.update(acodec="aac")
+    return (
+        ffmpeg
+        .output(*(joined[i] for i in range(int(video) + int(audio))), str(dst), **codecs)
+        .global_args("-hide_banner", "-loglevel", "error")
+        .overwrite_output()
+        .compile()
+    )
+
+def render_ranges(src: Path, ranges: List[Tuple[float, float]], dst: Path) -> None:
+    """Re-encode [start, end) ranges of *src* into *dst* with one ffmpeg run.
+
+    One ``trim``/``atrim`` + ``concat`` filtergraph reads and decodes the
+    source once and cuts frame-accurately, with no intermediate clips.
+    Video is encoded with libx264 at EXPORT_X264_PRESET/EXPORT_X264_CRF.
+
+    Raises:
+        ffmpeg.Error: If ffmpeg or ffprobe exits with a non-zero status
+    """
+    types = stream_types(src)
+    proc = subprocess.run(
+        _render_ranges_cmd(src, ranges, dst, "video" in types, "audio" in types),
+        stdin=subprocess.DEVNULL, capture_output=True
+    )
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", proc.stdout, proc.stderr)
+
+# How far before each cut the keyframe probe starts reading packets
+_KEYFRAME_LOOKBACK_SEC = 10.0
+
+def _keyframe_probe_cmd(src: Path, around: Optional[Sequence[float]] = None,
+                        lookback: float = _KEYFRAME_LOOKBACK_SEC) -> List[str]:
+    """ffprobe command line for :func:`keyframe_times`."""
+    args = ["ffprobe", "-v", "error", "-select_streams", "v:0"]
+    if around is not None:
+        # One read interval per cut, from *lookback* seconds before it to
+        # the cut itself; ffprobe seeks to each instead of reading the file
+        args += ["-read_intervals", ",".join(
+            f"{max(t - lookback, 0.0)}%{t}" for t in around
+        )]
+    return args + [
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", str(src),
+    ]
+
+def keyframe_times(src: Path, around: Optional[Sequence[float]] = None) -> np.ndarray:
+    """Timestamps of the video keyframes in *src*, in seconds.
+
+    Reads packet flags with ffprobe, so no frame is decoded. With *around*
+    only the packets shortly before those times are read, which finds the
+    keyframe each cut snaps to without scanning the whole file.
+
+    Args:
+        src: Media file
+        around: Times (seconds) to probe before; the whole file if omitted
+
+    Returns:
+        Sorted, de-duplicated float64 array; empty if *src* has no video
+        stream or *around* is empty
+
+    Raises:
+        ffmpeg.Error: If ffprobe exits with a non-zero status
+    """
+    if around is not None and len(around) == 0:
+        return np.empty(0, dtype=np.float64)
+    proc = subprocess.run(
+        _keyframe_probe_cmd(src, around),
+        stdin=subprocess.DEVNULL, capture_output=True
+    )
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffprobe", proc.stdout, proc.stderr)
+    times = [
+        float(pts) for pts, _, flags in (
+            line.partition(",") for line in proc.stdout.decode().splitlines()
+        )
+        if "K" in flags and pts not in ("", "N/A")
+    ]
+    return np.unique(np.asarray(times, dtype=np.float64))
+
+def snap_to_keyframes(ranges: List[Tuple[float, float]],
+                      keyframes: np.ndarray,
+                      tolerance: float = 0.05) -> Optional[List[Tuple[float, float]]]:
+    """Move range starts onto keyframes, if that leaves the edit intact.
+
+    A stream copy can only start on a keyframe. Copying is only allowed when
+    every range starts at most *tolerance* seconds after a keyframe and
+    does not reach back into the previous range once moved there. Moving a
+    start further back would bring cut material back into the export.
+
+    Returns:
+        Ranges starting on their keyframes, or None if they must be
+        re-encoded (including when *keyframes* is empty)
+    """
+    if not ranges:
+        return []
+    if keyframes.size == 0:
+        return None
+    starts = np.fromiter((start for start, _ in ranges), dtype=np.float64, count=len(ranges))
+    ends = np.fromiter((end for _, end in ranges), dtype=np.float64, count=len(ranges))
+    # Keyframe at or before each start (index -1 means none before it)
+    idx = np.searchsorted(keyframes, starts + 1e-9, side="right") - 1
+    if np.any(idx < 0):
+        return None
+    snapped = keyframes[idx]
+    if np.any(starts - snapped > tolerance) or np.any(snapped[1:] < ends[:-1]):
+        return None
+    return list(zip(snapped.tolist(), ends.tolist()))
@@ -1,27 +1,169 @@
 """
 SQLite database helpers for the WhisperX transcription app.
 """
+import atexit
+import functools
+import itertools
+import operator
 import sqlite3
 import pathlib
 import contextlib
+import threading
+import time
 import typing as t
+import weakref
 from pathlib import Path
 import logging
 
 from ez_clip_app.config import DB_PATH, Status
 from ez_clip_app.core.models import Segment, Word, TranscriptionResult
 from ez_clip_app.core import EditMask
-from pydantic import TypeAdapter
 
 logger = logging.getLogger(__name__)
 
-# TypeAdapters for efficient validation
-_seg_adapter = TypeAdapter(Segment)
-_word_adapter = TypeAdapter(Word)
+# Live DB instances, closed at interpreter exit (see DB.close). Held weakly,
+# so registering does not keep an instance or its connections alive.
+_OPEN_DBS: "weakref.WeakSet[DB]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all() -> None:
+    """Close every DB instance still alive at interpreter exit."""
+    for db in list(_OPEN_DBS):
+        db.close()
+
+
+# Buffered progress values are written at most this often (see update_progress)
+_PROGRESS_FLUSH_SEC = 0.25
+
+# Hot-path statements; constant strings keep hitting sqlite3's statement cache
+# (UPSERT ... RETURNING needs SQLite 3.35+)
+_SQL_UPSERT_MEDIA = """
+    INSERT INTO media_files(filepath) VALUES(?)
+    ON CONFLICT(filepath) DO UPDATE SET filepath = excluded.filepath
+    RETURNING id
+"""
+_SQL_SET_STATUS = "UPDATE media_files SET status = ? WHERE id = ?"
+_SQL_UPDATE_PROGRESS = "UPDATE media_files SET progress = ? WHERE id = ?"
+_SQL_SET_ERROR = "UPDATE media_files SET status = ?, error_msg = ? WHERE id = ?"
+# Polled by the UI; the statuses are constants, so they are inlined and the
+# cached statement runs with nothing to bind
+_SQL_ACTIVE_JOBS = f"""
+    SELECT id, filepath, status, progress
+    FROM media_files
+    WHERE status IN ({", ".join(f"'{status}'" for status in Status.ACTIVE)})
+"""
+# The same query narrowed to the jobs the UI tracks (placeholders appended)
+_SQL_ACTIVE_JOBS_BY_ID = _SQL_ACTIVE_JOBS + "AND id IN ({})"
+_SQL_MEDIA_PATH = "SELECT filepath FROM media_files WHERE id = ?"
+_SQL_SET_LAST_POS = "UPDATE media_files SET last_pos = ? WHERE id = ?"
+# The mask plus what EditMask.loads needs: the word count (counted in SQL
+# rather than by loading the transcript) and whether a transcript exists
+_SQL_GET_EDIT_MASK = """
+    SELECT m.mask_json,
+           (SELECT COUNT(*) FROM words AS w
+            JOIN segments AS s ON s.id = w.segment_id
+            WHERE s.media_id = m.media_id) AS total_words,
+           EXISTS(SELECT 1 FROM transcripts AS tr
+                  WHERE tr.media_id = m.media_id) AS has_transcript
+    FROM edit_masks AS m
+    WHERE m.media_id = ?
+"""
+_SQL_WORD_COUNT = """
+    SELECT COUNT(*) FROM words AS w
+    JOIN segments AS s ON s.id = w.segment_id
+    WHERE s.media_id = ?
+"""
+_SQL_SAVE_EDIT_MASK = "INSERT OR REPLACE INTO edit_masks(media_id, mask_json) VALUES(?, ?)"
+# Segments LEFT JOIN their words, one row per word (or one word-less row for
+# an empty segment). DB._segment_from_rows reads these columns by position
+_SQL_SEGMENTS_WITH_WORDS = """
+    SELECT s.id AS seg_id, s.speaker, s.start_sec AS seg_start,
+           s.end_sec AS seg_end, s.text AS seg_text,
+           w.text, w.start_sec, w.end_sec, w.score
+    FROM segments AS s
+    LEFT JOIN words AS w ON w.segment_id = s.id
+    WHERE s.{key} = ?
+    ORDER BY s.start_sec, s.id, w.start_sec
+"""
+_SQL_MEDIA_SEGMENTS = _SQL_SEGMENTS_WITH_WORDS.format(key="media_id")
+_SQL_MEDIA_SEGMENTS_NO_WORDS = """
+    SELECT id, speaker, start_sec, end_sec, text
+    FROM segments
+    WHERE media_id = ?
+    ORDER BY start_sec, id
+"""
+_SQL_SEGMENT_BY_ID = _SQL_SEGMENTS_WITH_WORDS.format(key="id")
+
+# Transcript, speaker and editing statements
+_SQL_DELETE_SEGMENTS = "DELETE FROM segments WHERE media_id = ?"
+_SQL_DELETE_TRANSCRIPTS = "DELETE FROM transcripts WHERE media_id = ?"
+_SQL_INSERT_TRANSCRIPT = "INSERT INTO transcripts(media_id, full_text, duration) VALUES(?, ?, ?)"
+_SQL_INSERT_SEGMENT = """
+    INSERT INTO segments(media_id, speaker, start_sec, end_sec, text)
+    VALUES(?, ?, ?, ?, ?)
+"""
+_SQL_SEGMENT_IDS = "SELECT id FROM segments WHERE media_id = ? ORDER BY id"
+_SQL_INSERT_WORD = """
+    INSERT INTO words(segment_id, text, start_sec, end_sec, score)
+    VALUES(?, ?, ?, ?, ?)
+"""
+_SQL_LATEST_TRANSCRIPT = """
+    SELECT * FROM transcripts
+    WHERE media_id = ?
+    ORDER BY id DESC  -- Fetch the latest entry
+    LIMIT 1           -- Only fetch one
+"""
+_SQL_FINISHED_MEDIA = """
+    SELECT id, filepath
+    FROM media_files
+    WHERE status = ?
+    ORDER BY added_at DESC
+"""
+_SQL_SPEAKER_NAMES = "SELECT speaker, name FROM speakers WHERE media_id = ?"
+_SQL_SET_SPEAKER_NAME = "INSERT OR REPLACE INTO speakers(media_id, speaker, name) VALUES(?, ?, ?)"
+_SQL_SET_LATEST_FULL_TEXT = """
+    UPDATE transcripts
+    SET full_text = ?
+    WHERE media_id = ?
+      AND id = (SELECT id FROM transcripts
+                WHERE media_id = ? ORDER BY id DESC LIMIT 1)
+"""
+_SQL_DELETE_SPEAKERS = "DELETE FROM speakers WHERE media_id = ?"
+_SQL_DELETE_MEDIA = "DELETE FROM media_files WHERE id = ?"
+_SQL_SEGMENT_WORDS = "SELECT * FROM words WHERE segment_id = ? ORDER BY start_sec"
+_SQL_UPDATE_WORD = "UPDATE words SET text = ? WHERE id = ? AND segment_id = ? AND text IS NOT ?"
+_SQL_REBUILD_SEGMENT_TEXT = """
+    UPDATE segments
+    SET text = COALESCE((
+        SELECT group_concat(text, ' ') FROM (
+            SELECT text FROM words
+            WHERE segment_id = ?
+            ORDER BY start_sec
+        )
+    ), '')
+    WHERE id = ?
+    RETURNING media_id
+"""
+_SQL_SET_FULL_TEXT = "UPDATE transcripts SET full_text = ? WHERE media_id = ?"
+_SQL_SEGMENT_TEXTS = "SELECT speaker, text FROM segments WHERE media_id = ? ORDER BY start_sec"
+_SQL_SET_MEDIA_PATH = "UPDATE media_files SET filepath = ? WHERE id = ?"
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_sql() -> str:
+    """Read schema.sql once per process."""
+    return (Path(__file__).parent / "schema.sql").read_text()
+
 
 class DB:
     """Database interface for the WhisperX app."""
     
+    # WAL is a persistent property of the database file, so it only needs
+    # switching on by the first connection to each file
+    _wal_files: t.Set[str] = set()
+    _wal_lock = threading.Lock()
+    
     def __init__(self, db_path: t.Union[str, Path] = DB_PATH):
         """Initialize database connection.
         
@@ -29,38 +171,127 @@ class DB:
             db_path: Path to SQLite database. Can be ":memory:" for in-memory testing.
         """
         self.db_path = Path(db_path)
+        # sqlite3.connect and the WAL registry take the path as a string
+        self._db_path_str = str(self.db_path)
+        # One long-lived connection per thread (see _get_connection); every
+        # connection is also tracked so close() can finalize all of them
+        self._local = threading.local()
+        self._conns: t.List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        # Write-behind buffer for update_progress: media_id -> latest value
+        self._progress_buf: t.Dict[int, float] = {}
+        self._progress_lock = threading.Lock()
+        self._progress_flushed_at = 0.0
+        _OPEN_DBS.add(self)
         self._ensure_tables()
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        # Enable foreign keys
-        conn.execute("PRAGMA foreign_keys = ON")
+        """Get this thread's database connection, opening it on first use.
+        
+        The connection is kept open for the lifetime of the thread and runs
+        in autocommit mode (``isolation_level=None``): single statements
+        commit on their own and write methods delimit multi-statement
+        transactions explicitly with :meth:`_transaction`. One connection per
+        thread acts as the pool: in WAL mode the UI thread's reads never wait
+        for a worker's write, writers queue on ``BEGIN IMMEDIATE`` for up to
+        ``busy_timeout`` ms, and ``synchronous=NORMAL`` skips the per-commit
+        fsync that WAL makes safe to drop.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() may finalize it from
+            # another thread; each connection is otherwise used by its owner
+            conn = sqlite3.connect(
+                self._db_path_str,
+                isolation_level=None,
+                cached_statements=256,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            self._enable_wal(conn)
+            # Per-connection settings: wait up to 5 s for the write lock,
+            # checkpoint every 1000 WAL pages, 64 MB page cache, 256 MB mmap
+            conn.executescript(
+                "PRAGMA busy_timeout = 5000;"
+                "PRAGMA wal_autocheckpoint = 1000;"
+                "PRAGMA synchronous = NORMAL;"
+                "PRAGMA temp_store = MEMORY;"
+                "PRAGMA cache_size = -64000;"
+                "PRAGMA mmap_size = 268435456;"
+                # Enable foreign keys
+                "PRAGMA foreign_keys = ON;"
+            )
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
         return conn
     
+    @contextlib.contextmanager
+    def _transaction(self) -> t.Iterator[sqlite3.Connection]:
+        """Run the body as one write transaction on this thread's connection.
+        
+        ``BEGIN IMMEDIATE`` takes the write lock up front, so a transaction
+        never fails half-way on a lock upgrade. Nested use joins the outer
+        transaction.
+        
+        Yields:
+            This thread's connection
+        """
+        conn = self._get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def _enable_wal(self, conn: sqlite3.Connection):
+        """Switch the database file to WAL mode once per process."""
+        if self._db_path_str in DB._wal_files:
+            return
+        with DB._wal_lock:
+            if self._db_path_str not in DB._wal_files:
+                conn.execute("PRAGMA journal_mode = WAL")
+                DB._wal_files.add(self._db_path_str)
+    
+    def close(self):
+        """Close every connection opened by this instance.
+        
+        Called for every live instance at exit so WAL files are checkpointed.
+        Threads that use the instance afterwards transparently reconnect.
+        """
+        # Closing must not fail just because the last progress tick can't land
+        try:
+            self._flush_progress()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not flush buffered progress: {e}")
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+    
     def _ensure_tables(self):
-        """Ensure all required tables exist."""
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path) as f:
-            schema_sql = f.read()
-        
-        # Modify the schema to use "IF NOT EXISTS" to handle existing tables
-        # This ensures that the script won't fail if tables already exist
-        with self._get_connection() as conn:
-            # First check if we already have the required tables
-            tables = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()
-            
-            if tables:
-                # Tables exist, just make sure foreign keys are enabled
-                conn.execute("PRAGMA foreign_keys = ON")
-                logger.info("Database tables already exist, skipping schema creation")
-            else:
-                # No tables, execute the full schema
-                logger.info("Creating new database schema")
-                conn.executescript(schema_sql)
+        """Ensure all required tables and indexes exist.
+        
+        Every statement in schema.sql is idempotent (``IF [NOT] EXISTS``), so
+        the whole script simply runs on every start; it is a no-op on an
+        up-to-date database and upgrades older ones in place.
+        """
+        conn = self._get_connection()
+        # schema_version is bumped by any DDL that actually changes
+        # something, and is 0 for a brand-new database
+        before = conn.execute("PRAGMA schema_version").fetchone()[0]
+        conn.executescript(_schema_sql())
+        after = conn.execute("PRAGMA schema_version").fetchone()[0]
+        if before and after != before:
+            # Give the planner statistics for new indexes
+            logger.info("Database schema upgraded, running ANALYZE")
+            conn.execute("ANALYZE")
     
     def insert_media(self, path: t.Union[str, Path]) -> int:
         """Insert a new media file or get existing ID.
@@ -71,22 +302,11 @@ class DB:
         Returns:
             The media file ID
         """
-        path_str = str(path)
-        with self._get_connection() as conn:
-            # Try to insert new record
-            cur = conn.execute(
-                "INSERT OR IGNORE INTO media_files(filepath) VALUES(?)",
-                (path_str,)
-            )
-            # If inserted, return new ID, otherwise look up existing ID
-            if cur.rowcount > 0:
-                return cur.lastrowid
-            else:
-                row = conn.execute(
-                    "SELECT id FROM media_files WHERE filepath=?",
-                    (path_str,)
-                ).fetchone()
-                return row["id"]
+        path_str = path if isinstance(path, str) else str(path)
+        with self._transaction() as conn:
+            # The no-op DO UPDATE makes RETURNING yield the id on conflict
+            # too, so new and existing files both take one statement
+            return conn.execute(_SQL_UPSERT_MEDIA, (path_str,)).fetchone()[0]
     
     def set_status(self, media_id: int, status: str):
         """Update the status of a media file.
@@ -95,23 +315,40 @@ class DB:
             media_id: Media file ID
             status: New status (queued, running, done, error)
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE media_files SET status = ? WHERE id = ?",
-                (status, media_id)
-            )
+        # Buffered progress must land before the status it leads up to
+        self._flush_progress()
+        with self._transaction() as conn:
+            conn.execute(_SQL_SET_STATUS, (status, media_id))
     
     def update_progress(self, media_id: int, progress: float):
         """Update the progress of a media file.
         
+        Values are buffered in memory and written in one ``executemany`` at
+        most every ``_PROGRESS_FLUSH_SEC``, so bursts of ticks collapse into a
+        single commit. Reads through this instance (``get_active_jobs``) and
+        status changes flush the buffer first.
+        
         Args:
             media_id: Media file ID
             progress: Progress percentage (0-100)
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE media_files SET progress = ? WHERE id = ?",
-                (progress, media_id)
+        with self._progress_lock:
+            self._progress_buf[media_id] = progress
+            due = time.monotonic() - self._progress_flushed_at >= _PROGRESS_FLUSH_SEC
+        if due:
+            self._flush_progress()
+    
+    def _flush_progress(self):
+        """Write buffered progress values in a single transaction."""
+        with self._progress_lock:
+            if not self._progress_buf:
+                return
+            pending, self._progress_buf = self._progress_buf, {}
+            self._progress_flushed_at = time.monotonic()
+        with self._transaction() as conn:
+            conn.executemany(
+                _SQL_UPDATE_PROGRESS,
+                [(progress, media_id) for media_id, progress in pending.items()]
             )
     
     def set_error(self, media_id: int, error_msg: str):
@@ -121,11 +358,9 @@ class DB:
             media_id: Media file ID
             error_msg: Error message
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE media_files SET status = ?, error_msg = ? WHERE id = ?",
-                (Status.ERROR, error_msg, media_id)
-            )
+        self._flush_progress()
+        with self._transaction() as conn:
+            conn.execute(_SQL_SET_ERROR, (Status.ERROR, error_msg, media_id))
     
     def save_transcript(self, media_id: int, full_text: str, duration: float, segments: t.List[dict]) -> int:
         """Save transcript and segments. Ensures only one transcript row exists per media_id.
@@ -139,30 +374,24 @@ class DB:
         Returns:
             Transcript ID
         """
-        # Establish a connection and transaction context
-        with self._get_connection() as conn:
+        # The whole save is one write transaction
+        with self._transaction() as conn:
             # Delete existing segments and the main transcript row for this media_id
             # to prevent duplicates and ensure only the latest data is stored.
-            conn.execute("DELETE FROM segments WHERE media_id = ?", (media_id,))
-            conn.execute("DELETE FROM transcripts WHERE media_id = ?", (media_id,))
+            conn.execute(_SQL_DELETE_SEGMENTS, (media_id,))
+            conn.execute(_SQL_DELETE_TRANSCRIPTS, (media_id,))
             
             # Insert the main transcript record
             cur = conn.execute(
-                "INSERT INTO transcripts(media_id, full_text, duration) VALUES(?, ?, ?)",
-                (media_id, full_text, duration)
+                _SQL_INSERT_TRANSCRIPT, (media_id, full_text, duration)
             )
             # Retrieve the ID of the inserted transcript row
             transcript_id = cur.lastrowid
             
-            # Iterate through the provided segments and insert each one
-            for segment in segments:
-                # Insert the segment and get its ID
-                cur = conn.execute(
-                    """
-                    INSERT INTO segments(
-                        media_id, speaker, start_sec, end_sec, text
-                    ) VALUES(?, ?, ?, ?, ?)
-                    """,
+            # Insert all segments in one executemany call
+            conn.executemany(
+                _SQL_INSERT_SEGMENT,
+                (
                     (
                         media_id,
                         # Use provided speaker or default to 'SPEAKER_UNKNOWN'
@@ -171,119 +400,146 @@ class DB:
                         segment["end"],   # End time of the segment
                         segment["text"],  # Text content of the segment
                     )
+                    for segment in segments
                 )
-                segment_id = cur.lastrowid
-                
-                # Insert words with segment_id FK
-                for w in segment.get("words", []):
-                    conn.execute(
-                        """INSERT INTO words
-                           (segment_id, text, start_sec, end_sec, score)
-                           VALUES (?,?,?,?,?)""",
-                        (
-                            segment_id,                    # FK to segments table
-                            w["word"],
-                            float(w["start"]),
-                            float(w["end"]),
-                            float(w.get("score", 0)),
-                        ),
+            )
+            
+            # AUTOINCREMENT ids grow in insertion order, and this media's old
+            # segments were deleted above, so the ids line up with `segments`
+            segment_ids = [
+                row[0] for row in conn.execute(_SQL_SEGMENT_IDS, (media_id,))
+            ]
+            
+            # Insert words with segment_id FK
+            conn.executemany(
+                _SQL_INSERT_WORD,
+                (
+                    (
+                        segment_id,                    # FK to segments table
+                        w["word"],
+                        float(w["start"]),
+                        float(w["end"]),
+                        float(w.get("score", 0)),
                     )
+                    for segment_id, segment in zip(segment_ids, segments)
+                    for w in segment.get("words", [])
+                )
+            )
             
             # Return the ID of the main transcript record
             return transcript_id
     
-    def get_active_jobs(self) -> t.List[sqlite3.Row]:
-        """Get all active jobs for progress tracking.
+    def get_active_jobs(self, ids: t.Optional[t.Collection[int]] = None) -> t.List[sqlite3.Row]:
+        """Get active jobs for progress tracking.
+        
+        Args:
+            ids: Only return these jobs (none at all if empty); all active
+                jobs if omitted
         
         Returns:
             List of row objects with id, filepath, status, progress
         """
-        with self._get_connection() as conn:
-            return conn.execute(
-                """
-                SELECT id, filepath, status, progress
-                FROM media_files
-                WHERE status IN (?, ?)
-                """,
-                (Status.QUEUED, Status.RUNNING)
-            ).fetchall()
+        if ids is not None and not ids:
+            return []
+        
+        # Show the latest buffered progress values
+        self._flush_progress()
+        conn = self._get_connection()
+        if ids is None:
+            return conn.execute(_SQL_ACTIVE_JOBS).fetchall()
+        ids = tuple(ids)
+        sql = _SQL_ACTIVE_JOBS_BY_ID.format(", ".join("?" * len(ids)))
+        return conn.execute(sql, ids).fetchall()
+    
+    @staticmethod
+    def _segment_from_rows(rows: t.Iterable[sqlite3.Row]) -> Segment:
+        """Build a Segment model from its joined segment/word rows.
+        
+        Args:
+            rows: Rows of one segment from ``_SQL_SEGMENTS_WITH_WORDS``
+        """
+        rows = list(rows)
+        seg = rows[0]
+        speaker = seg[1]
+        # Rows come from our own schema, so the models are built without
+        # validation, reading columns by position (see the SELECT list).
+        # Words inherit the segment's speaker; a segment without words comes
+        # back as a single NULL-word row
+        word_models = [
+            Word.model_construct(w=w[5], s=w[6], e=w[7], score=w[8], speaker=speaker)
+            for w in rows if w[5] is not None
+        ]
+        return Segment.model_construct(
+            id=seg[0],
+            speaker=speaker,
+            start_sec=seg[2],
+            end_sec=seg[3],
+            text=seg[4],
+            words=word_models
+        )
+    
+    def iter_segments(self, media_id: int, include_words: bool = True) -> t.Iterator[Segment]:
+        """Yield the segments of a media file, with words, in start-time order.
+        
+        Rows are read and validated one segment at a time, so callers that
+        render progressively never hold the whole transcript twice.
+        
+        Args:
+            media_id: Media file ID
+            include_words: Set to False by callers that only need segment
+                speaker/timing/text; the words table is then never read and
+                every ``Segment.words`` is empty
+            
+        Yields:
+            Segment objects
+        """
+        conn = self._get_connection()
+        if not include_words:
+            for row in conn.execute(_SQL_MEDIA_SEGMENTS_NO_WORDS, (media_id,)):
+                yield Segment.model_construct(
+                    id=row[0],
+                    speaker=row[1],
+                    start_sec=row[2],
+                    end_sec=row[3],
+                    text=row[4],
+                    words=[]
+                )
+            return
+        
+        # One JOIN query instead of a words query per segment; rows arrive
+        # grouped by segment, so each group is one Segment
+        cur = conn.execute(_SQL_MEDIA_SEGMENTS, (media_id,))
+        for _, rows in itertools.groupby(cur, key=operator.itemgetter(0)):
+            yield self._segment_from_rows(rows)
     
-    def get_transcript(self, media_id: int) -> TranscriptionResult:
+    def get_transcript(self, media_id: int, include_words: bool = True) -> TranscriptionResult:
         """Get the most recent complete transcript with segments for a media file.
         
         Args:
             media_id: Media file ID
+            include_words: Set to False to skip loading words (see iter_segments)
             
         Returns:
             TranscriptionResult object with transcript and segments, or None if not found.
         """
-        with self._get_connection() as conn:
-            # Get the most recent transcript row for the given media_id
-            transcript = conn.execute(
-                """
-                SELECT * FROM transcripts
-                WHERE media_id = ?
-                ORDER BY id DESC  -- Fetch the latest entry
-                LIMIT 1           -- Only fetch one
-                """,
-                (media_id,)
-            ).fetchone()
+        conn = self._get_connection()
+        # Get the most recent transcript row for the given media_id
+        transcript = conn.execute(_SQL_LATEST_TRANSCRIPT, (media_id,)).fetchone()
 
-            # If no transcript record found, return None
-            if not transcript:
-                logger.warning(f"No transcript found for media_id {media_id}")
-                return None
+        # If no transcript record found, return None
+        if not transcript:
+            logger.warning(f"No transcript found for media_id {media_id}")
+            return None
 
-            # Get associated segments (still ordered by start time)
-            segments = conn.execute(
-                """
-                SELECT * FROM segments
-                WHERE media_id = ?
-                ORDER BY start_sec
-                """,
-                (media_id,)
-            ).fetchall()
-            
-            # Convert rows to dictionaries and fetch associated words
-            segments_list = []
-            for seg in segments:
-                seg_dict = dict(seg)  # sqlite Row → dict
-                # fetch words for this segment_id
-                seg_words = conn.execute(
-                    "SELECT * FROM words WHERE segment_id=? ORDER BY start_sec",
-                    (seg_dict["id"],)
-                ).fetchall()
-                
-                # Convert words to Word model instances
-                word_models = []
-                for w in seg_words:
-                    word_dict = dict(w)
-                    word = _word_adapter.validate_python({
-                        "w": word_dict["text"],
-                        "s": word_dict["start_sec"],
-                        "e": word_dict["end_sec"],
-                        "score": word_dict["score"],
-                        "speaker": seg_dict["speaker"]  # NEW - pass speaker from segment
-                    })
-                    word_models.append(word)
-                
-                # Create a Segment model instance
-                segment = _seg_adapter.validate_python({
-                    "id": seg_dict["id"],
-                    "speaker": seg_dict["speaker"],
-                    "start_sec": seg_dict["start_sec"],
-                    "end_sec": seg_dict["end_sec"],
-                    "text": seg_dict["text"],
-                    "words": word_models
-                })
-                segments_list.append(segment)
-            
-            # Create and return TranscriptionResult
-            return TranscriptionResult(
-                segments=segments_list,
-                duration=transcript["duration"],
-                full_text=transcript["full_text"]
-            )
+        # Get associated segments (still ordered by start time)
+        segments_list = list(self.iter_segments(media_id, include_words))
+        
+        # Create and return TranscriptionResult
+        return TranscriptionResult(
+            segments=segments_list,
+            duration=transcript["duration"],
+            full_text=transcript["full_text"]
+        )
     
     def get_media_path(self, media_id: int) -> str:
         """Get the file path for a media ID.
@@ -294,12 +550,9 @@ class DB:
         Returns:
             File path string
         """
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT filepath FROM media_files WHERE id = ?",
-                (media_id,)
-            ).fetchone()
-            return row["filepath"] if row else None
+        conn = self._get_connection()
+        row = conn.execute(_SQL_MEDIA_PATH, (media_id,)).fetchone()
+        return row["filepath"] if row else None
             
     def get_finished_media(self) -> t.List[sqlite3.Row]:
         """Get all completed media files.
@@ -307,16 +560,8 @@ class DB:
         Returns:
             List of row objects with id, filepath
         """
-        with self._get_connection() as conn:
-            return conn.execute(
-                """
-                SELECT id, filepath 
-                FROM media_files 
-                WHERE status = ? 
-                ORDER BY added_at DESC
-                """,
-                (Status.DONE,)
-            ).fetchall()
+        conn = self._get_connection()
+        return conn.execute(_SQL_FINISHED_MEDIA, (Status.DONE,)).fetchall()
             
     def get_speaker_map(self, media_id: int) -> t.Dict[str, str]:
         """Get speaker name mapping for a media file.
@@ -327,15 +572,8 @@ class DB:
         Returns:
             Dictionary mapping speaker IDs to names
         """
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT speaker, name 
-                FROM speakers 
-                WHERE media_id = ?
-                """,
-                (media_id,)
-            ).fetchall()
+        conn = self._get_connection()
+        rows = conn.execute(_SQL_SPEAKER_NAMES, (media_id,)).fetchall()
         return {row["speaker"]: row["name"] for row in rows}
         
     def set_speaker_name(self, media_id: int, speaker_id: str, name: str):
@@ -346,17 +584,12 @@ class DB:
             speaker_id: Speaker ID
             name: Speaker name
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO speakers(media_id, speaker, name) 
-                VALUES(?, ?, ?)
-                """,
-                (media_id, speaker_id, name)
-            )
-        
-        # Regenerate full transcript to reflect updated speaker names
-        self._regenerate_full_text(media_id)
+        with self._transaction() as conn:
+            conn.execute(_SQL_SET_SPEAKER_NAME, (media_id, speaker_id, name))
+            
+            # Regenerate full transcript to reflect updated speaker names
+            # (joins this transaction)
+            self._regenerate_full_text(media_id)
             
     def update_transcript_text(self, media_id: int, new_text: str):
         """Overwrite full_text for latest transcript of media_id.
@@ -365,25 +598,16 @@ class DB:
             media_id: Media file ID
             new_text: New transcript text
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                UPDATE transcripts
-                SET full_text = ?
-                WHERE media_id = ?
-                  AND id = (SELECT id FROM transcripts
-                            WHERE media_id = ? ORDER BY id DESC LIMIT 1)
-                """,
-                (new_text, media_id, media_id)
-            )
+        with self._transaction() as conn:
+            conn.execute(_SQL_SET_LATEST_FULL_TEXT, (new_text, media_id, media_id))
             
     def delete_media(self, media_id: int):
         """Completely remove a media file and all its associated data."""
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             # Delete speakers explicitly (belt and suspenders, normally handled by cascade)
-            conn.execute("DELETE FROM speakers WHERE media_id = ?", (media_id,))
+            conn.execute(_SQL_DELETE_SPEAKERS, (media_id,))
             # This will cascade delete related transcripts, segments, and words
-            conn.execute("DELETE FROM media_files WHERE id = ?", (media_id,))
+            conn.execute(_SQL_DELETE_MEDIA, (media_id,))
             
     def get_segment(self, segment_id: int) -> Segment:
         """Get a specific segment with its words.
@@ -394,47 +618,16 @@ class DB:
         Returns:
             Segment object with words
         """
-        with self._get_connection() as conn:
-            # Get the segment
-            row = conn.execute(
-                "SELECT * FROM segments WHERE id=?", 
-                (segment_id,)
-            ).fetchone()
-            
-            if not row:
-                raise ValueError(f"Segment with ID {segment_id} not found")
-            
-            # Get all words for this segment
-            words = conn.execute(
-                "SELECT * FROM words WHERE segment_id=? ORDER BY start_sec",
-                (segment_id,)
-            ).fetchall()
-            
-            # Convert words to Word model instances
-            word_models = []
-            for w in words:
-                word_dict = dict(w)
-                word = _word_adapter.validate_python({
-                    "w": word_dict["text"],
-                    "s": word_dict["start_sec"],
-                    "e": word_dict["end_sec"],
-                    "score": word_dict["score"],
-                    "speaker": dict(row)["speaker"]  # NEW - pass speaker from segment
-                })
-                word_models.append(word)
-            
-            # Create a Segment model instance
-            seg_dict = dict(row)
-            segment = _seg_adapter.validate_python({
-                "id": seg_dict["id"],
-                "speaker": seg_dict["speaker"],
-                "start_sec": seg_dict["start_sec"],
-                "end_sec": seg_dict["end_sec"],
-                "text": seg_dict["text"],
-                "words": word_models
-            })
-            
-            return segment
+        conn = self._get_connection()
+        # Get the segment joined with all its words
+        rows = conn.execute(_SQL_SEGMENT_BY_ID, (segment_id,)).fetchall()
+        
+        if not rows:
+            raise ValueError(f"Segment with ID {segment_id} not found")
+        
+        segment = self._segment_from_rows(rows)
+        
+        return segment
             
     def get_words_by_segment(self, segment_id: int) -> t.List[sqlite3.Row]:
         """Get words for a specific segment.
@@ -445,11 +638,8 @@ class DB:
         Returns:
             List of word rows sorted by start time
         """
-        with self._get_connection() as conn:
-            return conn.execute(
-                "SELECT * FROM words WHERE segment_id=? ORDER BY start_sec",
-                (segment_id,)
-            ).fetchall()
+        conn = self._get_connection()
+        return conn.execute(_SQL_SEGMENT_WORDS, (segment_id,)).fetchall()
 
     def update_word(self, segment_id: int, word_id: int, new_text: str):
         """Patch a single word & cascade text updates.
@@ -459,17 +649,21 @@ class DB:
             word_id: Word ID
             new_text: New word text
         """
-        with self._get_connection() as conn:
-            # Update the word text
-            conn.execute(
-                "UPDATE words SET text=? WHERE id=? AND segment_id=?", 
-                (new_text, word_id, segment_id)
+        with self._transaction() as conn:
+            # Update the word text; an edit that leaves the text as it was
+            # (or names no such word) changes nothing, so the segment and
+            # transcript rebuilds below are skipped
+            cur = conn.execute(
+                _SQL_UPDATE_WORD, (new_text, word_id, segment_id, new_text)
             )
+            if cur.rowcount == 0:
+                return
             
-            # Get the media_id from the segment
+            # Rebuild segment.text from all its words inside SQLite (the
+            # ordered subquery feeds group_concat in start_sec order); the
+            # media_id comes back from the same statement
             row = conn.execute(
-                "SELECT media_id FROM segments WHERE id=?", 
-                (segment_id,)
+                _SQL_REBUILD_SEGMENT_TEXT, (segment_id, segment_id)
             ).fetchone()
             
             if not row:
@@ -477,20 +671,34 @@ class DB:
                 
             media_id = row["media_id"]
             
-            # Rebuild segment.text from all its words
-            words = conn.execute(
-                "SELECT text FROM words WHERE segment_id=? ORDER BY start_sec", 
-                (segment_id,)
-            ).fetchall()
-            
-            sentence = " ".join(w["text"] for w in words)
+            # Finally regenerate the full transcript in the same transaction,
+            # straight from the rows rather than a re-fetched TranscriptionResult
             conn.execute(
-                "UPDATE segments SET text=? WHERE id=?",
-                (sentence, segment_id)
+                _SQL_SET_FULL_TEXT, (self._render_markdown(conn, media_id), media_id)
             )
+    
+    @staticmethod
+    def _render_markdown(conn: sqlite3.Connection, media_id: int) -> str:
+        """Render the Markdown transcript of a media file from its rows.
+        
+        Only segment speakers and texts feed the Markdown, so words are
+        never read and no models are built.
+        
+        Args:
+            conn: Open connection (may be inside a transaction)
+            media_id: Media file ID
             
-        # Finally regenerate full transcript via formatting util
-        self._regenerate_full_text(media_id)
+        Returns:
+            Markdown transcript with speaker names applied
+        """
+        seg_dicts = [
+            {"speaker": row[0], "text": row[1]}
+            for row in conn.execute(_SQL_SEGMENT_TEXTS, (media_id,))
+        ]
+        speaker_map = dict(conn.execute(_SQL_SPEAKER_NAMES, (media_id,)).fetchall())
+        
+        from ez_clip_app.core.formatting import segments_to_markdown
+        return segments_to_markdown(seg_dicts, speaker_map, presorted=True)
 
     def _regenerate_full_text(self, media_id: int):
         """Regenerate full markdown transcript from segments.
@@ -498,23 +706,14 @@ class DB:
         Args:
             media_id: Media file ID
         """
-        result = self.get_transcript(media_id)  # TranscriptionResult
-        if result is None:
-            logger.warning(f"Cannot regenerate full text: no transcript for media_id {media_id}")
-            return
-            
-        # Convert segment models to dicts for formatting
-        seg_dicts = [s.model_dump() for s in result.segments]
-        speaker_map = self.get_speaker_map(media_id)
-        
-        from ez_clip_app.core.formatting import segments_to_markdown
-        new_md = segments_to_markdown(seg_dicts, speaker_map)
-        
-        with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE transcripts SET full_text=? WHERE media_id=?",
-                (new_md, media_id)
+        with self._transaction() as conn:
+            # Render straight from the segment/speaker rows; no models or
+            # per-segment dicts from a TranscriptionResult round-trip
+            cur = conn.execute(
+                _SQL_SET_FULL_TEXT, (self._render_markdown(conn, media_id), media_id)
             )
+            if cur.rowcount == 0:
+                logger.warning(f"Cannot regenerate full text: no transcript for media_id {media_id}")
     
     def get_edit_mask(self, media_id: int) -> "EditMask | None":
         """Get the edit mask for a media file.
@@ -525,23 +724,25 @@ class DB:
         Returns:
             EditMask object or None if not found
         """
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT mask_json FROM edit_masks WHERE media_id = ?",
-                (media_id,)
-            ).fetchone()
-            
-            if not row:
-                return None
-                
-            # Get total words count to initialize the mask
-            result = self.get_transcript(media_id)
-            if not result:
-                return None
-                
-            total_words = sum(len(seg.words) for seg in result.segments)
+        conn = self._get_connection()
+        row = conn.execute(_SQL_GET_EDIT_MASK, (media_id,)).fetchone()
+        
+        if not row or not row["has_transcript"]:
+            return None
+        
+        return EditMask.loads(media_id, row["mask_json"], row["total_words"])
+    
+    def get_word_count(self, media_id: int) -> int:
+        """Count the words of a media file's transcript without loading it.
+        
+        Args:
+            media_id: Media file ID
             
-            return EditMask.loads(media_id, row["mask_json"], total_words)
+        Returns:
+            Number of words (0 if there is no transcript)
+        """
+        conn = self._get_connection()
+        return conn.execute(_SQL_WORD_COUNT, (media_id,)).fetchone()[0]
     
     def save_edit_mask(self, mask: EditMask) -> None:
         """Save an edit mask to the database.
@@ -549,14 +750,8 @@ class DB:
         Args:
             mask: EditMask object to save
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO edit_masks(media_id, mask_json) 
-                VALUES(?, ?)
-                """,
-                (mask.media_id, mask.dumps())
-            )
+        with self._transaction() as conn:
+            conn.execute(_SQL_SAVE_EDIT_MASK, (mask.media_id, mask.dumps()))
     
     def update_media_last_pos(self, media_id: int, pos: float) -> None:
         """Update the last playback position of a media file.
@@ -565,11 +760,8 @@ class DB:
             media_id: Media file ID
             pos: Position in seconds
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE media_files SET last_pos = ? WHERE id = ?",
-                (pos, media_id)
-            )
+        with self._transaction() as conn:
+            conn.execute(_SQL_SET_LAST_POS, (pos, media_id))
     
     def update_media_path(self, media_id: int, new_path: str) -> None:
         """Update the file path of a media file.
@@ -578,8 +770,5 @@ class DB:
             media_id: Media file ID
             new_path: New file path
         """
-        with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE media_files SET filepath = ? WHERE id = ?",
-                (new_path, media_id)
-            )
\ No newline at end of file
+        with self._transaction() as conn:
+            conn.execute(_SQL_SET_MEDIA_PATH, (new_path, media_id))
\ No newline at end of file
@@ -1,5 +1,5 @@
 -- ---------- MEDIA FILES ----------
-CREATE TABLE media_files (
+CREATE TABLE IF NOT EXISTS media_files (
     id        INTEGER PRIMARY KEY AUTOINCREMENT,
     filepath  TEXT UNIQUE NOT NULL,
     added_at  TEXT DEFAULT CURRENT_TIMESTAMP,
@@ -8,9 +8,11 @@ CREATE TABLE media_files (
     error_msg TEXT,
     last_pos  REAL DEFAULT 0
 );
+-- UI progress poll filters on status (see DB.get_active_jobs)
+CREATE INDEX IF NOT EXISTS idx_media_status ON media_files(status);
 
 -- ---------- TRANSCRIPTS ----------
-CREATE TABLE transcripts (
+CREATE TABLE IF NOT EXISTS transcripts (
     id        INTEGER PRIMARY KEY AUTOINCREMENT,
     media_id  INTEGER REFERENCES media_files(id) ON DELETE CASCADE,
     full_text TEXT,
@@ -18,7 +20,7 @@ CREATE TABLE transcripts (
 );
 
 -- ---------- SEGMENTS ----------
-CREATE TABLE segments (
+CREATE TABLE IF NOT EXISTS segments (
     id         INTEGER PRIMARY KEY AUTOINCREMENT,
     media_id   INTEGER REFERENCES media_files(id) ON DELETE CASCADE,
     speaker    TEXT,
@@ -26,9 +28,11 @@ CREATE TABLE segments (
     end_sec    REAL,
     text       TEXT
 );
+-- get_transcript filters on media_id and orders by start_sec
+CREATE INDEX IF NOT EXISTS idx_segments_media_start ON segments(media_id, start_sec);
 
 -- ---------- WORDS ----------
-CREATE TABLE words (
+CREATE TABLE IF NOT EXISTS words (
     id         INTEGER PRIMARY KEY AUTOINCREMENT,
     segment_id INTEGER REFERENCES segments(id) ON DELETE CASCADE,
     text       TEXT NOT NULL,
@@ -36,10 +40,13 @@ CREATE TABLE words (
     end_sec    REAL NOT NULL,
     score      REAL DEFAULT 0
 );
-CREATE INDEX words_seg_idx ON words(segment_id);
+-- Words are always read per segment in start_sec order; this index
+-- supersedes the old single-column words_seg_idx
+DROP INDEX IF EXISTS words_seg_idx;
+CREATE INDEX IF NOT EXISTS idx_words_segment_start ON words(segment_id, start_sec);
 
 -- ---------- SPEAKERS ----------
-CREATE TABLE speakers (
+CREATE TABLE IF NOT EXISTS speakers (
     media_id INTEGER REFERENCES media_files(id) ON DELETE CASCADE,
     speaker  TEXT,
     name     TEXT,
@@ -49,7 +56,8 @@ CREATE TABLE speakers (
 -- ---------- EDIT MASKS ----------
 CREATE TABLE IF NOT EXISTS edit_masks (
     media_id INTEGER PRIMARY KEY REFERENCES media_files(id) ON DELETE CASCADE,
-    mask_json TEXT NOT NULL              -- {"kind":"mask-v1","remove":[[s,e],...]}
+    mask_json TEXT NOT NULL              -- {"kind":"mask-v1","remove":[[s,e],...]} or {"kind":"mask-v2","bits":...,"n":...}
 );
 
-PRAGMA foreign_keys = ON;
\ No newline at end of file
+-- foreign_keys is a per-connection setting: DB._get_connection enables it
+-- when each connection is opened
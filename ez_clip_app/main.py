@@ -4,12 +4,12 @@ Main entry point for the EZ Clip transcription app.
 """
 import sys
 import logging
+import logging.handlers
 import argparse
 from pathlib import Path
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon
-from ez_clip_app.ui.main_window import MainWindow
+from PySide6.QtWidgets import QApplication, QSplashScreen
+from PySide6.QtGui import QIcon, QPixmap
 from ez_clip_app.assets import ezclip_rc  # noqa: F401  (ensure resource import)
 
 # Configure logging
@@ -18,13 +18,23 @@ def setup_logging(verbose=False):
     log_level = logging.DEBUG if verbose else logging.INFO
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
+    # Buffer log-file records and write them in small batches; warnings and
+    # errors flush at once, and logging's own atexit hook flushes whatever is
+    # left on a normal exit. The buffer is kept small since it is lost on a
+    # signal or a native crash (torch, CTranslate2).
+    file_handler = logging.FileHandler(Path.home() / '.ez_clip_app.log', delay=True)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=32, flushLevel=logging.WARNING, target=file_handler
+    )
+    
     # Configure root logger
     logging.basicConfig(
         level=log_level,
         format=log_format,
         handlers=[
             logging.StreamHandler(),
-            logging.FileHandler(Path.home() / '.ez_clip_app.log')
+            memory_handler
         ]
     )
     
@@ -53,8 +63,17 @@ def main():
     # Set global app icon (visible in task-switcher, Dock, etc.)
     app.setWindowIcon(QIcon(":/ezclip_icon"))
     
+    # Paint a splash screen before importing the window, which pulls in
+    # the pipeline, the database layer and QtMultimedia
+    splash = QSplashScreen(QPixmap(":/ezclip_icon"))
+    splash.show()
+    app.processEvents()
+    
+    from ez_clip_app.ui.main_window import MainWindow
+    
     window = MainWindow()
     window.show()
+    splash.finish(window)
     sys.exit(app.exec())
 
 if __name__ == '__main__':
@@ -2,6 +2,21 @@
 UI package for the EZ Clip transcription app.
 """
 
-from .word_toggle_view import WordToggleView
-from .transport_bar import TransportBar
-from .media_pane import MediaPane
\ No newline at end of file
+# Widgets are imported on first access (PEP 562), so importing a submodule
+# such as ``ez_clip_app.ui.event_bus`` does not pull in QtMultimedia
+_LAZY = {
+    "WordToggleView": ".word_toggle_view",
+    "TransportBar": ".transport_bar",
+    "MediaPane": ".media_pane",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -4,16 +4,51 @@ Editor controller for the EZ CLIP application.
 This module handles operations related to the word-level editing functionality.
 """
 import logging
+import operator
+import queue
+import sqlite3
+import threading
 import time
-import tempfile
+import typing as t
+from itertools import chain, compress
 from pathlib import Path
 
+import numpy as np
+from PySide6.QtCore import QTimer
+
+from ez_clip_app.config import EXPORT_FRAME_ACCURATE
 from ez_clip_app.data.database import DB
 from ez_clip_app.core import EditMask, PreviewRebuilder
+from ez_clip_app.core.models import Word
 from ez_clip_app.ui.event_bus import BUS
 
 logger = logging.getLogger(__name__)
 
+# Toggled masks are written back once clicking pauses for this long
+_MASK_SAVE_DELAY_MS = 500
+# Bursts of toggles collapse into one preview request after this much quiet
+_PREVIEW_DELAY_MS = 150
+
+# Word field getters, applied in C by map()
+_get_w = operator.attrgetter("w")
+_get_s = operator.attrgetter("s")
+_get_e = operator.attrgetter("e")
+
+
+def _srt_timestamps(secs: np.ndarray) -> list[str]:
+    """Format an array of seconds as SRT timestamps (``HH:MM:SS,mmm``).
+    
+    Hours, minutes, seconds and milliseconds are split for all values at
+    once with two ``np.divmod`` calls; only the string formatting is per value.
+    """
+    ms = (secs % 1 * 1000).astype(np.int64)
+    m, s = np.divmod(secs.astype(np.int64), 60)
+    h, m = np.divmod(m, 60)
+    return [
+        f"{hh:02d}:{mm:02d}:{ss:02d},{mss:03d}"
+        for hh, mm, ss, mss in zip(h.tolist(), m.tolist(), s.tolist(), ms.tolist())
+    ]
+
 
 class EditorController:
     """Controller for word-level editing operations.
@@ -34,9 +69,191 @@ class EditorController:
         # Current media being edited
         self.current_media_id = None
         
+        # Per-media edit masks and flattened word lists, loaded once
+        self._mask_cache: dict[int, EditMask] = {}
+        self._words_cache: dict[int, list[Word]] = {}
+        
+        # Media paths already found on disk, re-checked after a library refresh
+        self._path_cache: dict[int, Path] = {}
+        
+        # Masks changed since the last save, written by a debounce timer
+        self._dirty: set[int] = set()
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self.flush_masks)
+        
+        # Snapshots handed to the background writer, latest per media; the
+        # one-slot queue only wakes the writer, so repeated flushes coalesce
+        self._pending_saves: dict[int, EditMask] = {}
+        self._pending_lock = threading.Lock()
+        self._save_q: queue.Queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self._save_loop, name="mask-writer", daemon=True).start()
+        
+        # Coalesces toggles into one preview request; the handle of the
+        # last scheduled build lets a newer toggle cancel it
+        self._pending_media_id = None
+        self._preview_handle = None
+        self._preview_timer = QTimer()
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(_PREVIEW_DELAY_MS)
+        self._preview_timer.timeout.connect(
+            lambda: BUS.requestPreviewBuild.emit(self._pending_media_id)
+        )
+        
         # Connect to event bus
         BUS.wordToggled.connect(self.toggle_word)
+        BUS.wordsToggled.connect(self.toggle_words)
         BUS.requestPreviewBuild.connect(self.build_preview)
+        BUS.mediaDeleted.connect(self.forget)
+        BUS.refreshLibrary.connect(self._forget_paths)
+    
+    def load(self, media_id: int, words: list[Word]) -> EditMask:
+        """Cache *words* for a media file and return its edit mask.
+        
+        Called whenever a transcript is (re)loaded for display, so cached
+        words pick up edited text and the view shares the cached mask.
+        
+        Args:
+            media_id: Media ID
+            words: Flattened words of the transcript
+            
+        Returns:
+            The cached edit mask, created (all words kept) if missing;
+            None if there are no words
+        """
+        self._words_cache[media_id] = words
+        return self._mask(media_id, len(words))
+    
+    def _mask(self, media_id: int, total_words: t.Optional[int] = None) -> t.Optional[EditMask]:
+        """Return the cached edit mask, loading or creating it on first access.
+        
+        Args:
+            media_id: Media ID
+            total_words: Word count for a new mask; counted in SQL if omitted
+            
+        Returns:
+            The edit mask, or None if the media has no words
+        """
+        edit_mask = self._mask_cache.get(media_id) or self.db.get_edit_mask(media_id)
+        if not edit_mask:
+            if total_words is None:
+                total_words = self.db.get_word_count(media_id)
+            if not total_words:
+                return None
+            edit_mask = EditMask(media_id, [True] * total_words)
+            self.db.save_edit_mask(edit_mask)
+        self._mask_cache[media_id] = edit_mask
+        return edit_mask
+    
+    def forget(self, media_id: int) -> None:
+        """Drop cached state for a media file, e.g. after it was deleted.
+        
+        Args:
+            media_id: Media ID
+        """
+        self._mask_cache.pop(media_id, None)
+        self._words_cache.pop(media_id, None)
+        self._path_cache.pop(media_id, None)
+        self._dirty.discard(media_id)
+        with self._pending_lock:
+            self._pending_saves.pop(media_id, None)
+        
+        # Nothing left to preview for it
+        if self._pending_media_id == media_id:
+            self._preview_timer.stop()
+            self._cancel_preview()
+    
+    def _forget_paths(self) -> None:
+        """Re-check media paths on next use (files may have moved)."""
+        self._path_cache.clear()
+    
+    def flush_masks(self, wait: bool = False) -> None:
+        """Hand every mask toggled since the last save to the writer thread.
+        
+        Args:
+            wait: Block until the writer has saved them (e.g. on shutdown)
+        """
+        self._save_timer.stop()
+        if self._dirty:
+            # Copy keep[] so later toggles cannot tear a save in progress
+            with self._pending_lock:
+                while self._dirty:
+                    mask = self._mask_cache[self._dirty.pop()]
+                    self._pending_saves[mask.media_id] = EditMask(
+                        mask.media_id, mask.keep.copy(), mask.kind
+                    )
+            try:
+                self._save_q.put_nowait(None)
+            except queue.Full:
+                pass  # the writer is already due to pick them up
+        if wait:
+            self._save_q.join()
+    
+    def _save_loop(self) -> None:
+        """Writer thread: save the latest pending masks whenever woken."""
+        while True:
+            self._save_q.get()
+            try:
+                with self._pending_lock:
+                    pending, self._pending_saves = self._pending_saves, {}
+                for mask in pending.values():
+                    try:
+                        self.db.save_edit_mask(mask)
+                    except sqlite3.Error as e:
+                        logger.warning("Could not save edit mask for media %d: %s",
+                                       mask.media_id, e)
+            finally:
+                self._save_q.task_done()
+    
+    def _cancel_preview(self) -> None:
+        """Cancel the last scheduled preview build, if it has not run."""
+        if self._preview_handle is not None:
+            self._preview_handle.cancel()
+            self._preview_handle = None
+    
+    def _media_path(self, media_id: int) -> t.Tuple[t.Optional[Path], bool]:
+        """Return the media file path and whether it exists.
+        
+        A path that exists is cached, so later calls skip the query and
+        the stat until the library is refreshed.
+        
+        Args:
+            media_id: Media ID
+            
+        Returns:
+            ``(path, exists)``; path is None if the media is unknown
+        """
+        path = self._path_cache.get(media_id)
+        if path is not None:
+            return path, True
+        media_path = self.db.get_media_path(media_id)
+        if not media_path:
+            return None, False
+        path = Path(media_path)
+        if not path.exists():
+            return path, False
+        self._path_cache[media_id] = path
+        return path, True
+    
+    def _cached(self, media_id: int) -> t.Optional[t.Tuple[EditMask, list[Word]]]:
+        """Return the cached mask and words, loading them on first access.
+        
+        Args:
+            media_id: Media ID
+            
+        Returns:
+            ``(edit_mask, words)``, or None if there is no transcript
+        """
+        words = self._words_cache.get(media_id)
+        if words is None:
+            result = self.db.get_transcript(media_id)
+            if not result:
+                return None
+            words = list(chain.from_iterable(seg.words for seg in result.segments))
+        edit_mask = self.load(media_id, words)
+        if edit_mask is None:
+            return None
+        return edit_mask, words
     
     def toggle_word(self, media_id: int, idx: int, keep: bool) -> None:
         """Toggle a word's keep/cut state in the edit mask.
@@ -46,31 +263,39 @@ class EditorController:
             idx: Word index
             keep: Whether to keep (True) or cut (False) the word
         """
-        logger.debug("toggle_word: media=%d idx=%d keep=%s", media_id, idx, keep)
+        self.toggle_words(media_id, [idx], keep)
+    
+    def toggle_words(self, media_id: int, indices: list, keep: bool) -> None:
+        """Set the keep/cut state of several words with one save and preview.
+        
+        Args:
+            media_id: Media ID
+            indices: Word indices
+            keep: Whether to keep (True) or cut (False) the words
+        """
+        logger.debug("toggle_words: media=%d count=%d keep=%s", media_id, len(indices), keep)
         
         # Update current media ID
         self.current_media_id = media_id
         
-        # Get or create the edit mask
-        edit_mask = self.db.get_edit_mask(media_id)
-        if not edit_mask:
-            # Get total words to create mask
-            result = self.db.get_transcript(media_id)
-            if not result:
-                logger.error("No transcript found for media_id %d", media_id)
-                return
-                
-            total_words = sum(len(seg.words) for seg in result.segments)
-            edit_mask = EditMask(media_id, [True] * total_words)
+        # Get or create the edit mask (toggling never needs the words)
+        edit_mask = self._mask(media_id)
+        if edit_mask is None:
+            logger.error("No transcript found for media_id %d", media_id)
+            return
         
-        # Update the mask
-        edit_mask.keep[idx] = keep
+        # Update the cached mask in place
+        edit_mask.keep[indices] = keep
         
-        # Save to database
-        self.db.save_edit_mask(edit_mask)
+        # Save to database once the clicking stops
+        self._dirty.add(media_id)
+        self._save_timer.start(_MASK_SAVE_DELAY_MS)
         
-        # Request preview rebuild
-        BUS.requestPreviewBuild.emit(media_id)
+        # Request a preview rebuild once the burst of toggles settles,
+        # dropping any rebuild scheduled for the previous state
+        self._cancel_preview()
+        self._pending_media_id = media_id
+        self._preview_timer.start()
     
     def build_preview(self, media_id: int) -> None:
         """Build a preview for the current edit mask.
@@ -80,83 +305,75 @@ class EditorController:
         """
         start_time = time.time()
         
-        # Get the edit mask
-        edit_mask = self.db.get_edit_mask(media_id)
-        if not edit_mask:
-            logger.warning("No edit mask found for media_id %d", media_id)
-            return
-            
-        # Get all words
-        all_words = []
-        result = self.db.get_transcript(media_id)
-        if not result:
+        # Get the edit mask and all words
+        cached = self._cached(media_id)
+        if not cached:
             logger.error("No transcript found for media_id %d", media_id)
             return
-            
-        for segment in result.segments:
-            for word in segment.words:
-                all_words.append(word)
-                
+        edit_mask, all_words = cached
+        
         # Get media path
-        media_path = self.db.get_media_path(media_id)
-        if not media_path or not Path(media_path).exists():
+        media_path, found = self._media_path(media_id)
+        if not found:
             logger.error("Media file not found: %s", media_path)
             return
             
-        # Schedule the rebuild
-        self.preview_rebuilder.schedule(edit_mask, all_words, media_path)
+        # Schedule the rebuild in place of the previous one
+        self._cancel_preview()
+        self._preview_handle = self.preview_rebuilder.schedule(edit_mask, all_words, media_path)
         
         elapsed = time.time() - start_time
         logger.info("Preview rebuilt in %.2fs", elapsed)
     
-    def export_clip(self, media_id: int, dest_path: Path) -> None:
+    def export_clip(self, media_id: int, dest_path: Path,
+                    frame_accurate: bool = EXPORT_FRAME_ACCURATE) -> None:
         """Export the current edit to a file.
         
         Args:
             media_id: Media ID
             dest_path: Destination path
+            frame_accurate: Always re-encode, even when the ranges could be
+                stream-copied
         """
-        from ez_clip_app.core.video_edit import extract_clip, concat_clips
+        from ez_clip_app.core.video_edit import (
+            concat_ranges, render_ranges, keyframe_times, snap_to_keyframes,
+            stream_types
+        )
         
-        # Get the edit mask
-        edit_mask = self.db.get_edit_mask(media_id)
-        if not edit_mask:
-            raise ValueError("No edit mask found")
-            
-        # Get all words
-        all_words = []
-        result = self.db.get_transcript(media_id)
-        if not result:
+        # Get the edit mask and all words
+        cached = self._cached(media_id)
+        if not cached:
             raise ValueError("No transcript found")
-            
-        for segment in result.segments:
-            for word in segment.words:
-                all_words.append(word)
-                
+        edit_mask, all_words = cached
+        
         # Get media path
-        media_path = self.db.get_media_path(media_id)
-        if not media_path or not Path(media_path).exists():
+        media_path, found = self._media_path(media_id)
+        if not found:
             raise ValueError(f"Media file not found: {media_path}")
             
         # Calculate time ranges
         ranges = edit_mask.build_ranges(all_words)
+        if not ranges:
+            raise ValueError("No clip ranges to export")
         
-        # Use temporary directory for intermediate clips
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_path = Path(tmp_dir)
-            clips = []
-            
-            # Extract each clip
-            for i, (start, end) in enumerate(ranges):
-                clip_path = tmp_path / f"{i:03d}.mp4"
-                clips.append(clip_path)
-                extract_clip(Path(media_path), clip_path, start, end)
-                
-            # Concatenate all clips
-            if clips:
-                concat_clips(clips, dest_path)
+        copied = None
+        if not frame_accurate:
+            if "video" in stream_types(media_path):
+                # A copied range can only start on a keyframe; probe just
+                # before each cut for one it can start on
+                keyframes = keyframe_times(media_path, around=[start for start, _ in ranges])
+                copied = snap_to_keyframes(ranges, keyframes)
             else:
-                raise ValueError("No clip ranges to export")
+                # Audio-only: a copy can start on any packet
+                copied = ranges
+        
+        if copied is not None:
+            # Stream-copy the ranges in one concat-demuxer run, nothing decoded
+            concat_ranges(media_path, copied, dest_path)
+        else:
+            # Cuts between keyframes need re-encoding so no cut material
+            # comes back; one trim/concat filtergraph decodes the source once
+            render_ranges(media_path, ranges, dest_path)
                 
         # Write SRT file
         self._write_srt(all_words, edit_mask, dest_path.with_suffix('.srt'))
@@ -175,49 +392,30 @@ class EditorController:
             return
             
         # Filter kept words
-        kept_words = [w for w, k in zip(words, edit_mask.keep) if k]
+        kept_words = list(compress(words, edit_mask.keep.tolist()))
         if not kept_words:
             return
-            
-        with open(srt_path, 'w') as f:
-            # Group words into sentences
-            groups = []
-            current_group = []
-            last_end = 0
-            
-            for word in kept_words:
-                # If there's a gap of more than 1 second, start new group
-                if current_group and (word.s - last_end) > 1.0:
-                    groups.append(current_group)
-                    current_group = []
-                
-                current_group.append(word)
-                last_end = word.e
-                
-            # Add the last group
-            if current_group:
-                groups.append(current_group)
-                
-            # Write SRT entries
-            for i, group in enumerate(groups):
-                # Calculate start/end times
-                start = group[0].s
-                end = group[-1].e
-                
-                # Format timestamps for SRT (HH:MM:SS,mmm)
-                start_h = int(start // 3600)
-                start_m = int((start % 3600) // 60)
-                start_s = int(start % 60)
-                start_ms = int((start % 1) * 1000)
-                
-                end_h = int(end // 3600)
-                end_m = int((end % 3600) // 60)
-                end_s = int(end % 60)
-                end_ms = int((end % 1) * 1000)
-                
-                # Write entry
-                f.write(f"{i+1}\n")
-                f.write(f"{start_h:02d}:{start_m:02d}:{start_s:02d},{start_ms:03d} --> ")
-                f.write(f"{end_h:02d}:{end_m:02d}:{end_s:02d},{end_ms:03d}\n")
-                f.write(" ".join(w.w for w in group))
-                f.write("\n\n")
\ No newline at end of file
+        
+        # Group words into sentences: a gap of more than 1 second between
+        # consecutive kept words starts a new group
+        n = len(kept_words)
+        starts = np.fromiter(map(_get_s, kept_words), dtype=np.float64, count=n)
+        ends = np.fromiter(map(_get_e, kept_words), dtype=np.float64, count=n)
+        breaks = np.flatnonzero(starts[1:] - ends[:-1] > 1.0) + 1
+        firsts = np.r_[0, breaks]
+        lasts = np.r_[breaks, n]
+        
+        # Timestamps of every group in one vectorized pass
+        group_starts = _srt_timestamps(starts[firsts])
+        group_ends = _srt_timestamps(ends[lasts - 1])
+        
+        # Format every entry first, then write the file in one call
+        entries = [
+            f"{i+1}\n{start} --> {end}\n"
+            f"{' '.join(map(_get_w, kept_words[lo:hi]))}\n\n"
+            for i, (start, end, lo, hi) in enumerate(
+                zip(group_starts, group_ends, firsts.tolist(), lasts.tolist())
+            )
+        ]
+        with open(srt_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write("".join(entries))
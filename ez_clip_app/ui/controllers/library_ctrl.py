@@ -64,7 +64,8 @@ class LibraryController:
         
         logger.info("Deleted media %s (ID: %d)", file_name, media_id)
         
-        # Signal library refresh
+        # Drop cached editor state, then signal library refresh
+        BUS.mediaDeleted.emit(media_id)
         BUS.refreshLibrary.emit()
     
     def get_transcript(self, media_id: int) -> TranscriptionResult:
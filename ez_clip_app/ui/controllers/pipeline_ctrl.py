@@ -5,6 +5,7 @@ This module handles media file transcription pipeline orchestration.
 """
 import logging
 import threading
+import time
 from pathlib import Path
 from collections import deque
 
@@ -23,27 +24,44 @@ class WorkerSignals(QObject):
     finished = Signal(int, int)  # job_id, transcript_id
     error = Signal(int, str)     # job_id, error_message
     progress = Signal(int, float)  # job_id, progress_percentage
+    status_changed = Signal(int, str)  # job_id, Status value
 
 
 class TranscriptionWorker(QRunnable):
-    """Worker thread for running transcription jobs."""
+    """Worker thread for running transcription jobs.
     
-    def __init__(self, job_id: int, media_path: Path, settings: JobSettings, db: DB):
+    Reports through a *signals* object shared by all workers; every signal
+    carries the job ID, so the receiver connects once for all jobs.
+    """
+    
+    def __init__(self, job_id: int, media_path: Path, settings: JobSettings, db: DB,
+                 signals: WorkerSignals):
         super().__init__()
         self.job_id = job_id
         self.media_path = media_path
         self.settings = settings
         self.db = db
-        self.signals = WorkerSignals()
+        self.signals = signals
+        self._last_emitted = -1.0
+        self._last_emit_time = 0.0
     
     @Slot()
     def run(self):
         """Process the file in a background thread."""
+        self.signals.status_changed.emit(self.job_id, Status.RUNNING)
         try:
             def progress_callback(prog):
-                # Debug log progress every 5%
-                if int(prog) % 5 == 0:
-                    logger.debug("Job %d progress: %.1f%%", self.job_id, prog)
+                # Only cross to the GUI thread on a meaningful change:
+                # a step of at least 1%, or any change after 50 ms
+                delta = prog - self._last_emitted
+                now = time.perf_counter()
+                if prog < 100 and delta < 1.0 and (
+                    delta <= 0 or now - self._last_emit_time < 0.05
+                ):
+                    return
+                self._last_emitted = prog
+                self._last_emit_time = now
+                logger.debug("Job %d progress: %.1f%%", self.job_id, prog)
                 self.signals.progress.emit(self.job_id, prog)
                 
             transcript_id = process_file(
@@ -52,12 +70,15 @@ class TranscriptionWorker(QRunnable):
                 self.db,
                 progress_callback
             )
+            self.signals.status_changed.emit(self.job_id, Status.DONE)
             self.signals.finished.emit(self.job_id, transcript_id)
         except PipelineError as e:
             logger.error("Pipeline error for job %d: %s", self.job_id, str(e), exc_info=True)
+            self.signals.status_changed.emit(self.job_id, Status.ERROR)
             self.signals.error.emit(self.job_id, str(e))
         except Exception as e:
             logger.error("Unexpected error for job %d: %s", self.job_id, str(e), exc_info=True)
+            self.signals.status_changed.emit(self.job_id, Status.ERROR)
             self.signals.error.emit(self.job_id, f"Unexpected error: {e}")
 
 
@@ -76,7 +97,20 @@ class PipelineController:
         self.db = db
         self.job_queue = deque()
         self.running_jobs = set()  # Track running job IDs
+        
+        # Dedicated pool with one long-lived thread per job slot: jobs always
+        # run on the same threads, which keep their GPU/torch thread state
+        # (models themselves are process-wide in model_cache)
         self.threadpool = QThreadPool()
+        self.threadpool.setMaxThreadCount(MAX_CONCURRENT_JOBS)
+        self.threadpool.setExpiryTimeout(-1)
+        
+        # One signals object for all workers, connected once
+        self.signals = WorkerSignals()
+        self.signals.progress.connect(self._on_progress)
+        self.signals.status_changed.connect(BUS.jobStatusChanged.emit)
+        self.signals.finished.connect(self._on_job_finished)
+        self.signals.error.connect(self._on_job_error)
         
         # Connect to event bus
         BUS.fileSelected.connect(self.enqueue)
@@ -109,35 +143,31 @@ class PipelineController:
         logger.info("Enqueued %s as job %d", path.name, job_id)
         
         # Start processing if possible
-        self.start_next()
+        self._drain()
         
         return job_id
     
-    def start_next(self):
-        """Start the next job in the queue if worker slots available."""
-        # Check if we can start another job
-        if len(self.running_jobs) >= MAX_CONCURRENT_JOBS or not self.job_queue:
-            return
+    def has_jobs(self) -> bool:
+        """Whether any job is queued or running (O(1))."""
+        return bool(self.running_jobs or self.job_queue)
+    
+    def _drain(self):
+        """Start queued jobs until every worker slot is taken."""
+        while len(self.running_jobs) < MAX_CONCURRENT_JOBS and self.job_queue:
+            # Get next job
+            job_id, media_path, settings = self.job_queue.popleft()
             
-        # Get next job
-        job_id, media_path, settings = self.job_queue.popleft()
-        
-        # Create worker
-        worker = TranscriptionWorker(job_id, media_path, settings, self.db)
-        
-        # Connect signals
-        worker.signals.progress.connect(self._on_progress)
-        worker.signals.finished.connect(self._on_job_finished)
-        worker.signals.error.connect(self._on_job_error)
-        
-        # Add to running set
-        self.running_jobs.add(job_id)
-        
-        # Start worker
-        self.threadpool.start(worker)
-        
-        # Update job status
-        self.db.set_status(job_id, Status.RUNNING)
+            # Create worker (only once it has a slot)
+            worker = TranscriptionWorker(job_id, media_path, settings, self.db, self.signals)
+            
+            # Add to running set
+            self.running_jobs.add(job_id)
+            
+            # Start worker
+            self.threadpool.start(worker)
+            
+            # Update job status
+            self.db.set_status(job_id, Status.RUNNING)
         
     def _on_progress(self, job_id: int, progress: float):
         """Handle job progress updates.
@@ -146,10 +176,7 @@ class PipelineController:
             job_id: Job ID
             progress: Progress percentage (0-100)
         """
-        # Update progress in DB
-        self.db.update_progress(job_id, progress)
-        
-        # Forward to event bus
+        # Forward to event bus; the pipeline has already written it to the DB
         BUS.jobProgress.emit(job_id, progress)
     
     def _on_job_finished(self, job_id: int, transcript_id: int):
@@ -160,7 +187,7 @@ class PipelineController:
             transcript_id: Transcript ID
         """
         # Remove from running set
-        self.running_jobs.remove(job_id)
+        self.running_jobs.discard(job_id)
         
         # Forward to event bus
         BUS.jobFinished.emit(job_id, transcript_id)
@@ -169,8 +196,8 @@ class PipelineController:
         # Log success
         logger.info("Job %d completed successfully", job_id)
         
-        # Start next job if available
-        self.start_next()
+        # Fill the freed slot from the queue
+        self._drain()
     
     def _on_job_error(self, job_id: int, error_msg: str):
         """Handle job errors.
@@ -180,7 +207,7 @@ class PipelineController:
             error_msg: Error message
         """
         # Remove from running set
-        self.running_jobs.remove(job_id)
+        self.running_jobs.discard(job_id)
         
         # Update DB with error status
         self.db.set_error(job_id, error_msg)
@@ -188,5 +215,5 @@ class PipelineController:
         # Log error
         logger.error("Job %d failed: %s", job_id, error_msg)
         
-        # Start next job if available
-        self.start_next()
\ No newline at end of file
+        # Fill the freed slot from the queue
+        self._drain()
\ No newline at end of file
@@ -25,12 +25,15 @@ class SignalBus(QObject):
     enqueueJob = Signal(Path, JobSettings)      # composite
     segmentChosen = Signal(int)                 # segment_id
     wordChosen = Signal(float)                  # start_sec
-    wordToggled = Signal(int, bool)             # idx, keep?
+    wordToggled = Signal(int, int, bool)        # media_id, idx, keep?
+    wordsToggled = Signal(int, list, bool)      # media_id, indices, keep?
 
     # ===== pipeline feedback =====
     jobProgress = Signal(int, float)            # job_id, %
     jobFinished = Signal(int, int)              # job_id, transcript_id
+    jobStatusChanged = Signal(int, str)         # job_id, Status value
     refreshLibrary = Signal()
+    mediaDeleted = Signal(int)                  # media_id
 
     # ===== preview / player =====
     requestPreviewBuild = Signal(int)           # media_id
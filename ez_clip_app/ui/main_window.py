@@ -11,7 +11,9 @@ forward to appropriate controllers.
 """
 import logging
 import threading
+import time
 import importlib.resources as pkg_res
+from itertools import chain
 from pathlib import Path
 
 from PySide6.QtCore import Qt, QTimer, QUrl
@@ -20,12 +22,12 @@ from PySide6.QtWidgets import (
     QSplitter, QTabWidget, QStackedWidget, QMessageBox, 
     QSystemTrayIcon, QInputDialog, QFileDialog
 )
-from PySide6.QtGui import QAction, QIcon
+from PySide6.QtGui import QAction, QCloseEvent, QIcon
 from PySide6.QtMultimedia import QSoundEffect
 
-from ez_clip_app.config import POLL_INTERVAL_MS, Status
+from ez_clip_app.config import POLL_INTERVAL_MS, POLL_INTERVAL_MAX_MS, Status
 from ez_clip_app.data.database import DB
-from ez_clip_app.core import EditMask, PreviewRebuilder
+from ez_clip_app.core import PreviewRebuilder
 
 # Import event bus
 from ez_clip_app.ui.event_bus import BUS
@@ -51,6 +53,10 @@ from ez_clip_app.assets import ezclip_rc  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
+# File dialog filters
+_MEDIA_FILTER = "Media Files (*.mp4 *.mp3 *.wav *.avi *.mkv *.m4a *.flac);;All Files (*)"
+_EXPORT_FILTER = "MP4 Video (*.mp4);;All Files (*)"
+
 
 class MainWindow(QMainWindow):
     """Main application window.
@@ -82,11 +88,12 @@ class MainWindow(QMainWindow):
         # Set up event bus connections
         self._init_connections()
         
-        # Set up timer for progress updates
+        # Safety-net DB poll for progress; workers push updates through the
+        # event bus, so the timer only runs while jobs are active
         self.timer = QTimer()
         self.timer.setInterval(POLL_INTERVAL_MS)
         self.timer.timeout.connect(self._poll_progress)
-        self.timer.start()
+        self._last_progress_change = 0.0
         
         # Tray icon
         self.tray = QSystemTrayIcon(self)
@@ -227,6 +234,7 @@ class MainWindow(QMainWindow):
         
         # Connect editor panel
         self.editor_panel.wordToggled.connect(BUS.wordToggled.emit)
+        self.editor_panel.wordsToggled.connect(BUS.wordsToggled.emit)
         
         # Connect media pane
         self.media_pane.positionChanged.connect(self._on_player_position_changed)
@@ -235,28 +243,37 @@ class MainWindow(QMainWindow):
         BUS.refreshLibrary.connect(self._on_refresh_library)
         BUS.jobProgress.connect(self._on_job_progress)
         BUS.jobFinished.connect(self._on_job_finished)
+        BUS.jobStatusChanged.connect(self._on_job_status_changed)
         BUS.fileSelected.connect(self._on_file_selected)
         BUS.enqueueJob.connect(self._on_enqueue_job)
     
     def _poll_progress(self):
-        """Poll database for progress updates on active jobs."""
-        active_jobs = self.db.get_active_jobs()
+        """Poll database for progress updates on active jobs.
+        
+        Only a safety net: workers push progress and status changes through
+        the event bus. The interval backs off while progress is stalled and
+        polling stops once no job is active.
+        """
+        # Only the jobs shown in the queue panel need updating
+        active_jobs = self.db.get_active_jobs(tuple(self.job_queue.active_jobs))
+        if not active_jobs:
+            self.timer.stop()
+            return
+        
+        # Back off while no progress has been reported recently
+        idle = time.monotonic() - self._last_progress_change
+        if idle < 2.0:
+            interval = POLL_INTERVAL_MS
+        elif idle < 10.0:
+            interval = min(4 * POLL_INTERVAL_MS, POLL_INTERVAL_MAX_MS)
+        else:
+            interval = POLL_INTERVAL_MAX_MS
+        if self.timer.interval() != interval:
+            self.timer.setInterval(interval)
         
         for row in active_jobs:
-            job_id = row['id']
-            status = row['status']
-            progress = row['progress']
-            
             # Update job queue
-            self.job_queue.update_progress(job_id, progress)
-            
-            # If job is done but we haven't processed it yet
-            if status == Status.DONE:
-                # Emit job finished signal
-                transcript = self.db.get_transcript(job_id)
-                if transcript:
-                    transcript_id = 0  # We don't actually need this, just emit job_id
-                    BUS.jobFinished.emit(job_id, transcript_id)
+            self.job_queue.update_progress(row['id'], row['progress'])
     
     def _on_file_selected(self, path: Path):
         """Handle file selection.
@@ -280,6 +297,11 @@ class MainWindow(QMainWindow):
         # Add to job queue panel
         job_id = self.pipeline_ctrl.enqueue(path, settings)
         self.job_queue.add_job(job_id, path)
+        
+        # Poll as a safety net until the queue drains, starting fast
+        self._last_progress_change = time.monotonic()
+        if not self.timer.isActive():
+            self.timer.start(POLL_INTERVAL_MS)
     
     def _on_job_progress(self, job_id: int, progress: float):
         """Handle job progress update.
@@ -288,6 +310,7 @@ class MainWindow(QMainWindow):
             job_id: Job ID
             progress: Progress percentage
         """
+        self._last_progress_change = time.monotonic()
         self.job_queue.update_progress(job_id, progress)
     
     def _on_job_finished(self, job_id: int, transcript_id: int):
@@ -306,6 +329,21 @@ class MainWindow(QMainWindow):
         
         # Refresh library to show the new item
         BUS.refreshLibrary.emit()
+        
+        # Stop the safety-net poll once nothing is queued or running
+        if not self.pipeline_ctrl.has_jobs():
+            self.timer.stop()
+    
+    def _on_job_status_changed(self, job_id: int, status: str):
+        """Handle a status change pushed by a worker, without touching the DB.
+        
+        Args:
+            job_id: Job ID
+            status: New Status value
+        """
+        if status == Status.ERROR:
+            self.job_queue.remove_job(job_id)
+            self.statusBar().showMessage(f"Job {job_id} failed", 5000)
     
     def _on_refresh_library(self):
         """Handle library refresh event."""
@@ -336,15 +374,10 @@ class MainWindow(QMainWindow):
         self.segments_panel.set_segments(result.segments, speaker_map)
         
         # Initialize editor panel
-        all_words = []
-        for segment in result.segments:
-            all_words.extend(segment.words)
+        all_words = list(chain.from_iterable(seg.words for seg in result.segments))
         
-        # Get or create edit mask
-        edit_mask = self.db.get_edit_mask(media_id)
-        if not edit_mask:
-            edit_mask = EditMask(media_id, [True] * len(all_words))
-            self.db.save_edit_mask(edit_mask)
+        # Get or create edit mask (cached by the editor controller)
+        edit_mask = self.editor_ctrl.load(media_id, all_words)
         
         # Set up editor panel
         self.editor_panel.set_media(media_id, all_words, edit_mask)
@@ -378,7 +411,7 @@ class MainWindow(QMainWindow):
                 self,
                 "Locate Media File",
                 str(Path.home()),
-                "Media Files (*.mp4 *.mp3 *.wav *.avi *.mkv *.m4a *.flac);;All Files (*)"
+                _MEDIA_FILTER
             )
             
             if new_path:
@@ -509,13 +542,11 @@ class MainWindow(QMainWindow):
         """
         # If Words tab is selected and no segment is selected, auto-select first row
         if index == 2 and self.words_panel.table.rowCount() == 0:
-            if self.segments_panel.table.rowCount() > 0:
+            # Get segment_id from the first row
+            segment_id = self.segments_panel.segment_id_at(0)
+            if segment_id is not None:
                 self.segments_panel.table.selectRow(0)
-                # Get segment_id from the first row
-                seg_item = self.segments_panel.table.item(0, 0)
-                if seg_item:
-                    segment_id = seg_item.data(Qt.UserRole)
-                    self._on_segment_clicked(segment_id)
+                self._on_segment_clicked(segment_id)
     
     def _on_export_clip(self):
         """Handle export clip action."""
@@ -528,12 +559,11 @@ class MainWindow(QMainWindow):
             return
         
         # Open file dialog for destination
-        file_dialog = QFileDialog()
-        dest_path, _ = file_dialog.getSaveFileName(
+        dest_path, _ = QFileDialog.getSaveFileName(
             self,
             "Export Edited Clip",
             str(Path.home()),
-            "MP4 Video (*.mp4);;All Files (*)"
+            _EXPORT_FILTER
         )
         
         if not dest_path:
@@ -574,4 +604,14 @@ class MainWindow(QMainWindow):
             f"{fname} is ready!",
             QSystemTrayIcon.Information,
             5000
-        )
\ No newline at end of file
+        )
+    
+    def closeEvent(self, event: QCloseEvent):
+        """Save pending edit-mask changes and close the DB before the window closes.
+        
+        Args:
+            event: Close event
+        """
+        self.editor_ctrl.flush_masks(wait=True)
+        self.db.close()
+        super().closeEvent(event)
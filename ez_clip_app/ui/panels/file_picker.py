@@ -11,6 +11,8 @@ from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QFileDialog
 
 logger = logging.getLogger(__name__)
 
+_MEDIA_FILTER = "Media (*.mp4 *.mp3 *.wav *.mkv *.avi *.m4a *.flac);;All (*)"
+
 
 class FilePickerPanel(QWidget):
     """Panel for selecting media files.
@@ -44,7 +46,7 @@ class FilePickerPanel(QWidget):
             self,
             "Open",
             str(Path.home()),
-            "Media (*.mp4 *.mp3 *.wav *.mkv *.avi *.m4a *.flac);;All (*)"
+            _MEDIA_FILTER
         )
         
         if path:
@@ -4,6 +4,8 @@ Job queue panel for the EZ CLIP application.
 This module provides a panel for monitoring active transcription jobs.
 """
 import logging
+import typing as t
+from dataclasses import dataclass
 from pathlib import Path
 
 from PySide6.QtCore import Qt, Signal
@@ -15,6 +17,15 @@ from PySide6.QtWidgets import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _ActiveJob:
+    """Widgets and last shown progress of one job in the queue panel."""
+    progress_bar: QProgressBar
+    widget: QWidget
+    file_path: str
+    last_progress: int = -1
+
+
 class JobQueuePanel(QWidget):
     """Panel for displaying and managing active jobs.
     
@@ -43,7 +54,7 @@ class JobQueuePanel(QWidget):
         layout.addWidget(self.group)
         
         # Store active jobs
-        self.active_jobs = {}
+        self.active_jobs: t.Dict[int, _ActiveJob] = {}
     
     def add_job(self, job_id: int, media_path: Path) -> None:
         """Add a job to the queue.
@@ -71,11 +82,11 @@ class JobQueuePanel(QWidget):
         self.jobs_layout.addWidget(job_widget)
         
         # Store reference
-        self.active_jobs[job_id] = {
-            'progress_bar': progress_bar,
-            'widget': job_widget,
-            'file_path': str(media_path)
-        }
+        self.active_jobs[job_id] = _ActiveJob(
+            progress_bar=progress_bar,
+            widget=job_widget,
+            file_path=str(media_path)
+        )
     
     def update_progress(self, job_id: int, progress: float) -> None:
         """Update job progress.
@@ -84,8 +95,15 @@ class JobQueuePanel(QWidget):
             job_id: Job ID
             progress: Progress percentage (0-100)
         """
-        if job_id in self.active_jobs:
-            self.active_jobs[job_id]['progress_bar'].setValue(int(progress))
+        job = self.active_jobs.get(job_id)
+        if job is None:
+            return
+        
+        # Skip the repaint when the displayed percentage is unchanged
+        value = int(progress)
+        if value != job.last_progress:
+            job.last_progress = value
+            job.progress_bar.setValue(value)
     
     def remove_job(self, job_id: int) -> None:
         """Remove a job from the queue.
@@ -93,11 +111,8 @@ class JobQueuePanel(QWidget):
         Args:
             job_id: Job ID
         """
-        if job_id in self.active_jobs:
+        job = self.active_jobs.pop(job_id, None)
+        if job is not None:
             # Remove from layout
-            job_widget = self.active_jobs[job_id]['widget']
-            self.jobs_layout.removeWidget(job_widget)
-            job_widget.deleteLater()
-            
-            # Remove from tracking dict
-            del self.active_jobs[job_id]
\ No newline at end of file
+            self.jobs_layout.removeWidget(job.widget)
+            job.widget.deleteLater()
\ No newline at end of file
@@ -5,9 +5,9 @@ This module provides a panel for displaying and interacting with transcript segm
 """
 import logging
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QTimer
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem
+    QWidget, QVBoxLayout, QTableView, QAbstractItemView
 )
 
 from ez_clip_app.core.models import Segment
@@ -15,6 +15,74 @@ from ez_clip_app.core.models import Segment
 logger = logging.getLogger(__name__)
 
 
+def _fmt_ts(sec: float) -> str:
+    """Format *sec* as ``MM:SS.ss`` for the Start/End columns."""
+    m, s = divmod(sec, 60.0)
+    return f"{int(m):02d}:{s:05.2f}"
+
+
+class SegmentsModel(QAbstractTableModel):
+    """Read-only table model over a list of segments.
+    
+    Cells are produced on demand in :meth:`data`, so loading a transcript is
+    one model reset instead of four QTableWidgetItems per segment, and rows
+    that are never scrolled into view are never formatted.
+    
+    Roles on column 0: ``Qt.UserRole`` is the segment ID and
+    ``Qt.UserRole + 1`` the raw speaker ID.
+    """
+    HEADERS = ("Speaker", "Start", "End", "Text")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._segments: list = []
+        self._speaker_map: dict = {}
+    
+    def set_segments(self, segments: list, speaker_map: dict) -> None:
+        """Replace the displayed segments in one model reset.
+        
+        Args:
+            segments: List of Segment objects
+            speaker_map: Dictionary mapping speaker IDs to names
+        """
+        self.beginResetModel()
+        self._segments = segments
+        self._speaker_map = speaker_map
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._segments)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        segment: Segment = self._segments[index.row()]
+        col = index.column()
+        
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return self._speaker_map.get(segment.speaker, segment.speaker)
+            if col == 1:
+                return _fmt_ts(segment.start_sec)
+            if col == 2:
+                return _fmt_ts(segment.end_sec)
+            return segment.text
+        
+        if col == 0 and role == Qt.UserRole:
+            return segment.id
+        if col == 0 and role == Qt.UserRole + 1:
+            return segment.speaker
+        return None
+
+
 class SegmentTablePanel(QWidget):
     """Panel for displaying and interacting with transcript segments.
     
@@ -35,15 +103,18 @@ class SegmentTablePanel(QWidget):
         """
         super().__init__(parent)
         
-        # Create table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Speaker", "Start", "End", "Text"])
+        # Create table view over the segments model
+        self.model = SegmentsModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.horizontalHeader().setStretchLastSection(True)
         
         # Connect signals
-        self.table.cellClicked.connect(self._on_cell_clicked)
-        self.table.cellDoubleClicked.connect(self._on_cell_double_clicked)
+        self.table.clicked.connect(lambda index: self._on_cell_clicked(index.row(), index.column()))
+        self.table.doubleClicked.connect(
+            lambda index: self._on_cell_double_clicked(index.row(), index.column())
+        )
         
         # Layout
         layout = QVBoxLayout(self)
@@ -58,9 +129,8 @@ class SegmentTablePanel(QWidget):
             col: Column index
         """
         # Get segment_id from the first column's UserRole data
-        seg_item = self.table.item(row, 0)
-        if seg_item:
-            segment_id = seg_item.data(Qt.UserRole)
+        segment_id = self.segment_id_at(row)
+        if segment_id is not None:
             self.segmentClicked.emit(segment_id)
     
     def _on_cell_double_clicked(self, row, col):
@@ -74,12 +144,21 @@ class SegmentTablePanel(QWidget):
         if col != 0:
             return
             
-        seg_item = self.table.item(row, 0)
-        if seg_item:
-            segment_id = seg_item.data(Qt.UserRole)
-            speaker_id = seg_item.data(Qt.UserRole + 1)  # Store speaker_id in UserRole+1
+        segment_id = self.segment_id_at(row)
+        if segment_id is not None:
+            speaker_id = self.model.index(row, 0).data(Qt.UserRole + 1)  # speaker_id in UserRole+1
             self.segmentDoubleClicked.emit(segment_id, speaker_id)
     
+    def segment_id_at(self, row: int):
+        """Return the segment ID shown in *row*, or None if out of range.
+        
+        Args:
+            row: Row index
+        """
+        if not 0 <= row < self.model.rowCount():
+            return None
+        return self.model.index(row, 0).data(Qt.UserRole)
+    
     def set_segments(self, segments: list, speaker_map: dict = None) -> None:
         """Set the segments to display.
         
@@ -89,41 +168,19 @@ class SegmentTablePanel(QWidget):
         """
         speaker_map = speaker_map or {}
         
-        # Set table rows
-        self.table.setRowCount(len(segments))
-        
-        for i, segment in enumerate(segments):
-            # Speaker column
-            speaker_id = segment.speaker
-            display_name = speaker_map.get(speaker_id, speaker_id)
-            speaker_item = QTableWidgetItem(display_name)
-            speaker_item.setData(Qt.UserRole, segment.id)
-            speaker_item.setData(Qt.UserRole + 1, speaker_id)
-            self.table.setItem(i, 0, speaker_item)
-            
-            # Start time column (format as MM:SS.ms)
-            start_secs = segment.start_sec
-            start_formatted = f"{int(start_secs // 60):02d}:{start_secs % 60:05.2f}"
-            start_item = QTableWidgetItem(start_formatted)
-            self.table.setItem(i, 1, start_item)
-            
-            # End time column (format as MM:SS.ms)
-            end_secs = segment.end_sec
-            end_formatted = f"{int(end_secs // 60):02d}:{end_secs % 60:05.2f}"
-            end_item = QTableWidgetItem(end_formatted)
-            self.table.setItem(i, 2, end_item)
-            
-            # Text column
-            text_item = QTableWidgetItem(segment.text)
-            self.table.setItem(i, 3, text_item)
+        # One model reset; cells are formatted lazily as they are painted
+        self.table.setUpdatesEnabled(False)
+        self.model.set_segments(segments, speaker_map)
+        self.table.setUpdatesEnabled(True)
         
-        self.table.resizeColumnsToContents()
+        # Size columns once the event loop is back, off the loading path
+        QTimer.singleShot(0, self.table.resizeColumnsToContents)
         
         # Auto-select first row if any rows exist
-        if self.table.rowCount() > 0:
+        if self.model.rowCount() > 0:
             self.table.selectRow(0)
             self._on_cell_clicked(0, 0)
     
     def clear(self) -> None:
         """Clear the table."""
-        self.table.setRowCount(0)
\ No newline at end of file
+        self.model.set_segments([], {})
\ No newline at end of file
@@ -22,8 +22,10 @@ class WordEditorPanel(QWidget):
     
     Signals:
         wordToggled: Emitted when a word is toggled
+        wordsToggled: Emitted when a selection of words is toggled
     """
     wordToggled = Signal(int, int, bool)  # media_id, idx, keep
+    wordsToggled = Signal(int, list, bool)  # media_id, indices, keep
     
     def __init__(self, parent=None):
         """Initialize the word editor panel.
@@ -39,6 +41,7 @@ class WordEditorPanel(QWidget):
         # Create word toggle view
         self.word_toggle = WordToggleView()
         self.word_toggle.wordToggled.connect(self._on_word_toggled)
+        self.word_toggle.wordsToggled.connect(self._on_words_toggled)
         
         # Layout
         layout = QVBoxLayout(self)
@@ -55,6 +58,16 @@ class WordEditorPanel(QWidget):
         if self.media_id is not None:
             self.wordToggled.emit(self.media_id, idx, keep)
     
+    def _on_words_toggled(self, indices: list, keep: bool):
+        """Handle a batch toggle event.
+        
+        Args:
+            indices: Word indices
+            keep: Keep state
+        """
+        if self.media_id is not None:
+            self.wordsToggled.emit(self.media_id, indices, keep)
+    
     def set_media(self, media_id: int, words: List[Word], mask: EditMask) -> None:
         """Set the media and words to display.
         
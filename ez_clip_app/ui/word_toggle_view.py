@@ -20,8 +20,11 @@ class WordToggleView(QTextBrowser):
     
     Signals:
         wordToggled: Emitted when a word is toggled with (index, keep) parameters
+        wordsToggled: Emitted once when a selection of words is toggled,
+            with (indices, keep) parameters
     """
     wordToggled = Signal(int, bool)  # index, keep
+    wordsToggled = Signal(list, bool)  # indices, keep
     
     def __init__(self, parent=None):
         """Initialize the WordToggleView.
@@ -155,16 +158,16 @@ class WordToggleView(QTextBrowser):
                     if match.start() >= cursor.selectionStart() and match.end() <= cursor.selectionEnd():
                         indices.append(idx)
                 
-                # Mark all selected words as cut
-                changed = False
-                for idx in indices:
-                    if idx < len(self.mask.keep) and self.mask.keep[idx]:
-                        self.mask.keep[idx] = False
-                        self.wordToggled.emit(idx, False)
-                        changed = True
+                # Mark all selected words as cut, reported as one batch
+                changed = [
+                    idx for idx in indices
+                    if idx < len(self.mask.keep) and self.mask.keep[idx]
+                ]
                 
                 # Update display if needed
                 if changed:
+                    self.mask.keep[changed] = False
+                    self.wordsToggled.emit(changed, False)
                     self._rebuild_html()
                 return
         
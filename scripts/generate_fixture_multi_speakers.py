@@ -33,7 +33,6 @@ from pathlib import Path
 # Add the parent directory to sys.path to make ez_clip_app importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-import tempfile
 from datetime import datetime
 from typing import Any, Dict, List
 
@@ -73,10 +72,10 @@ def build_fixture(
 ) -> Dict[str, Any]:
     """Run the heavy parts once and return a fully serialisable dict."""
     # ---------------- extraction + transcription ------------------
-    wav_path = extract_audio(video_path)
+    audio = extract_audio(video_path)
 
     result = transcribe(
-        wav_path,
+        audio,
         model_size=model_size,
         language=language,
         progress_callback=lambda p: None,          # suppress prints
@@ -88,7 +87,7 @@ def build_fixture(
     if diarize_flag:
         # WhisperX <-> pyannote bridge
         segments = diarize(
-            wav_path,
+            audio,
             segments,
             min_speakers=min_speakers,
             max_speakers=max_speakers,
@@ -181,15 +180,6 @@ def main(argv: list[str] | None = None) -> None:
           f"({len(fixture['segments'])} segments, "
           f"{fixture['duration']:.1f} s)")
 
-    # cleanup wav
-    try:
-        wav_path = next(
-            p for p in Path(tempfile.gettempdir()).glob("tmp*.wav") if p.exists()
-        )
-        wav_path.unlink(missing_ok=True)
-    except StopIteration:
-        pass
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -75,6 +75,13 @@ def patch_heavy_functions(mocker, fixture_transcription, fixture_data, tmp_path)
         side_effect=lambda *args, **kw: fixture_data["segments"],
     )
     
+    # Mock the background diarization model run (turns are ignored by the
+    # mocked diarize above)
+    mocker.patch(
+        "ez_clip_app.core.diarize.diarize_audio",
+        return_value=None,
+    )
+    
     # Mock extract_audio to avoid ffmpeg dependencies
     dummy_audio = tmp_path / "dummy.wav"
     dummy_audio.write_bytes(b"0")  # exists but content ignored
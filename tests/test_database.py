@@ -56,4 +56,175 @@ def test_insert_and_cascade(test_db, fixture_data):
 
     # delete media and ensure cascades
     test_db.delete_media(media_id)
-    assert test_db.get_transcript(media_id) is None
\ No newline at end of file
+    assert test_db.get_transcript(media_id) is None
+
+def test_connection_reused_in_wal_mode(tmp_path):
+    db = DB(tmp_path / "wal.db")
+    conn = db._get_connection()
+    assert db._get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    # Writes are visible on the same long-lived connection
+    media_id = db.insert_media("a.mp4")
+    assert db.get_media_path(media_id) == "a.mp4"
+    db.close()
+
+
+def test_close_finalizes_connections_from_all_threads(tmp_path):
+    import threading
+
+    db = DB(tmp_path / "threads.db")
+    main_conn = db._get_connection()
+    worker_conns = []
+    worker = threading.Thread(target=lambda: worker_conns.append(db._get_connection()))
+    worker.start()
+    worker.join()
+    assert worker_conns[0] is not main_conn
+
+    db.close()
+    for conn in (main_conn, worker_conns[0]):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    # The instance reconnects lazily after close()
+    assert db.insert_media("b.mp4") == 1
+    db.close()
+
+
+def test_exit_hook_does_not_keep_instances_alive(tmp_path):
+    import gc
+    import weakref
+    from ez_clip_app.data import database
+
+    db = DB(tmp_path / "weak.db")
+    assert db in database._OPEN_DBS
+    ref = weakref.ref(db)
+    del db
+    gc.collect()
+    assert ref() is None
+
+
+def test_iter_segments_streams_in_order(test_db, fixture_data):
+    media_id = test_db.insert_media("dummy.mp4")
+    test_db.save_transcript(media_id, "", 0.0, fixture_data["segments"])
+
+    it = test_db.iter_segments(media_id)
+    first = next(it)
+    rest = list(it)
+
+    starts = [s.start_sec for s in [first, *rest]]
+    assert starts == sorted(starts)
+    assert len(rest) + 1 == len(fixture_data["segments"])
+    assert first.words and all(w.speaker == first.speaker for w in first.words)
+
+
+def test_insert_media_returns_existing_id(test_db):
+    first = test_db.insert_media("same.mp4")
+    other = test_db.insert_media("other.mp4")
+    assert test_db.insert_media("same.mp4") == first
+    assert other != first
+
+
+def test_segments_without_words_survive_join(test_db):
+    media_id = test_db.insert_media("dummy.mp4")
+    segments = [
+        {"speaker": "A", "start": 0.0, "end": 1.0, "text": "",
+         "words": []},
+        {"speaker": "B", "start": 1.0, "end": 2.0, "text": "hi there",
+         "words": [{"word": "there", "start": 1.5, "end": 2.0},
+                   {"word": "hi", "start": 1.0, "end": 1.4}]},
+    ]
+    test_db.save_transcript(media_id, "", 2.0, segments)
+
+    empty, spoken = test_db.get_transcript(media_id).segments
+    assert empty.words == []
+    assert [w.w for w in spoken.words] == ["hi", "there"]
+    assert test_db.get_segment(spoken.id) == spoken
+
+
+def test_update_progress_is_write_behind(test_db):
+    media_id = test_db.insert_media("dummy.mp4")
+    conn = test_db._get_connection()
+
+    def stored():
+        return conn.execute(
+            "SELECT progress FROM media_files WHERE id = ?", (media_id,)
+        ).fetchone()[0]
+
+    test_db.update_progress(media_id, 10.0)  # first tick is written at once
+    test_db.update_progress(media_id, 20.0)
+    test_db.update_progress(media_id, 30.0)
+    assert stored() == 10.0
+
+    # Reads through the DB flush the buffer
+    [job] = test_db.get_active_jobs()
+    assert job["progress"] == 30.0 == stored()
+
+
+def test_get_active_jobs_filters_by_id(test_db):
+    first = test_db.insert_media("a.mp4")
+    second = test_db.insert_media("b.mp4")
+    done = test_db.insert_media("c.mp4")
+    test_db.set_status(done, Status.DONE)
+
+    assert {r["id"] for r in test_db.get_active_jobs()} == {first, second}
+    assert [r["id"] for r in test_db.get_active_jobs([second, done])] == [second]
+    assert test_db.get_active_jobs(()) == []
+
+
+def test_get_transcript_without_words(test_db, fixture_data):
+    media_id = test_db.insert_media("dummy.mp4")
+    test_db.save_transcript(media_id, "", 0.0, fixture_data["segments"])
+
+    full = test_db.get_transcript(media_id)
+    light = test_db.get_transcript(media_id, include_words=False)
+
+    assert all(not seg.words for seg in light.segments)
+    assert [s.model_dump(exclude={"words"}) for s in light.segments] == [
+        s.model_dump(exclude={"words"}) for s in full.segments
+    ]
+
+
+def test_failed_save_rolls_back(test_db, fixture_data):
+    media_id = test_db.insert_media("dummy.mp4")
+    test_db.save_transcript(media_id, "old", 1.0, fixture_data["segments"])
+
+    with pytest.raises(KeyError):
+        test_db.save_transcript(media_id, "new", 1.0, [{"text": "no timing"}])
+
+    # The DELETEs of the failed save were rolled back with it
+    result = test_db.get_transcript(media_id)
+    assert result.full_text == "old"
+    assert len(result.segments) == len(fixture_data["segments"])
+
+
+def test_update_word_without_change_skips_rebuild(test_db, fixture_data):
+    media_id = test_db.insert_media("dummy.mp4")
+    test_db.save_transcript(media_id, "custom text", 1.0, fixture_data["segments"])
+    seg = test_db.get_transcript(media_id).segments[0]
+    word = test_db.get_words_by_segment(seg.id)[0]
+
+    # Same text: nothing is rewritten, not even full_text
+    test_db.update_word(seg.id, word["id"], word["text"])
+    assert test_db.get_transcript(media_id).full_text == "custom text"
+
+    test_db.update_word(seg.id, word["id"], "changed")
+    result = test_db.get_transcript(media_id)
+    assert result.segments[0].text.startswith("changed")
+    assert "changed" in result.full_text
+
+
+def test_edit_mask_roundtrip_counts_words(test_db, fixture_data):
+    from ez_clip_app.core import EditMask
+
+    media_id = test_db.insert_media("dummy.mp4")
+    assert test_db.get_edit_mask(media_id) is None
+    assert test_db.get_word_count(media_id) == 0
+
+    test_db.save_transcript(media_id, "", 0.0, fixture_data["segments"])
+    total = sum(len(s.get("words", [])) for s in fixture_data["segments"])
+    assert test_db.get_word_count(media_id) == total
+    keep = [i % 3 != 0 for i in range(total)]
+    test_db.save_edit_mask(EditMask(media_id=media_id, keep=keep))
+
+    assert test_db.get_edit_mask(media_id).keep.tolist() == keep
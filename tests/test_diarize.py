@@ -0,0 +1,29 @@
+"""
+Unit tests for the diarization fallback speaker assignment.
+"""
+import numpy as np
+
+from ez_clip_app.core.diarize import _assign_speakers_by_grid
+
+
+def test_grid_assignment_majority_speaker():
+    starts = np.array([0.0, 5.0, 12.0])
+    ends = np.array([5.0, 9.0, 20.0])
+    speakers = np.array(["00", "01", "00"], dtype=object)
+    segments = [
+        {"start": 0.0, "end": 4.0},
+        {"start": 4.5, "end": 9.0},   # mostly SPEAKER_01
+        {"start": 9.2, "end": 11.0},  # silence between turns
+        {"start": 13.0, "end": 15.0},
+    ]
+
+    _assign_speakers_by_grid(starts, ends, speakers, segments)
+
+    assert [s["speaker"] for s in segments] == ["00", "01", "SPEAKER_UNKNOWN", "00"]
+
+
+def test_grid_assignment_without_turns():
+    segments = [{"start": 0.0, "end": 1.0}]
+    empty = np.array([])
+    _assign_speakers_by_grid(empty, empty, empty, segments)
+    assert segments[0]["speaker"] == "SPEAKER_UNKNOWN"
@@ -11,7 +11,8 @@ def test_edit_mask_initialization():
     """Test basic EditMask initialization."""
     mask = EditMask(media_id=1, keep=[True, False, True])
     assert mask.media_id == 1
-    assert mask.keep == [True, False, True]
+    assert mask.keep.dtype == bool
+    assert mask.keep.tolist() == [True, False, True]
     assert mask.kind == "mask-v1"
     assert mask._ranges == []
 
@@ -45,7 +46,7 @@ def test_dumps_loads_roundtrip():
     
     # Verify
     assert restored.media_id == original.media_id
-    assert restored.keep == original.keep
+    assert restored.keep.tolist() == original.keep.tolist()
     assert restored.kind == original.kind
 
 
@@ -97,5 +98,33 @@ def test_loads_with_different_total():
     # Load with a larger total_words
     loaded = EditMask.loads(1, json_str, 5)
     assert len(loaded.keep) == 5
-    assert loaded.keep[:3] == [True, False, True]  # Original part preserved
-    assert loaded.keep[3:] == [True, True]  # New elements set to True
\ No newline at end of file
+    assert loaded.keep[:3].tolist() == [True, False, True]  # Original part preserved
+    assert loaded.keep[3:].tolist() == [True, True]  # New elements set to True
+
+def test_packed_roundtrip():
+    """Test the bit-packed mask-v2 serialization roundtrip."""
+    keep = [True, False, False, True, True, False, True, True, True, False]
+    original = EditMask(media_id=1, keep=keep)
+
+    data = json.loads(original.dumps_packed())
+    assert data["kind"] == "mask-v2"
+    assert data["n"] == len(keep)
+
+    restored = EditMask.loads(1, original.dumps_packed(), len(keep))
+    assert restored.keep.tolist() == keep
+    assert restored.kind == "mask-v2"
+
+    # mask-v2 masks keep their format when saved again
+    assert json.loads(restored.dumps())["kind"] == "mask-v2"
+    assert EditMask.loads(1, restored.dumps(), len(keep) + 2).keep.tolist() == keep + [True, True]
+
+
+def test_word_times_cached_per_word_list():
+    words = [Word(w="a", s=0.0, e=0.5), Word(w="b", s=0.6, e=1.0)]
+    mask = EditMask(1, [True, False])
+    assert mask.build_ranges(words) == [(0.0, 0.5)]
+    starts, _ = mask._word_times(words)
+    assert mask._word_times(words)[0] is starts
+
+    mask.keep = [True, True]
+    assert mask.build_ranges(words) == [(0.0, 1.0)]
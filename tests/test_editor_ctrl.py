@@ -0,0 +1,93 @@
+"""
+Tests for the editor controller (mask cache and SRT export).
+"""
+from pathlib import Path
+
+import pytest
+
+from ez_clip_app.data.database import DB
+from ez_clip_app.ui.event_bus import BUS
+from ez_clip_app.ui.controllers.editor_ctrl import EditorController
+
+
+@pytest.fixture
+def editor(tmp_path, fixture_data):
+    db = DB(tmp_path / "editor.db")
+    media_id = db.insert_media("missing.mp4")
+    db.save_transcript(media_id, "", 0.0, fixture_data["segments"])
+
+    ctrl = EditorController(db, preview_rebuilder=None)
+    yield ctrl, media_id
+
+    BUS.wordToggled.disconnect(ctrl.toggle_word)
+    BUS.wordsToggled.disconnect(ctrl.toggle_words)
+    BUS.requestPreviewBuild.disconnect(ctrl.build_preview)
+    BUS.mediaDeleted.disconnect(ctrl.forget)
+    BUS.refreshLibrary.disconnect(ctrl._forget_paths)
+    db.close()
+
+
+def test_toggles_are_cached_and_saved_once(editor):
+    ctrl, media_id = editor
+
+    ctrl.toggle_word(media_id, 0, False)
+    ctrl.toggle_word(media_id, 2, False)
+
+    # The DB mask is created on first access; the toggles are still pending
+    assert all(ctrl.db.get_edit_mask(media_id).keep)
+    assert ctrl._mask_cache[media_id].keep[:3].tolist() == [False, True, False]
+
+    ctrl.flush_masks(wait=True)
+    assert ctrl.db.get_edit_mask(media_id).keep[:3].tolist() == [False, True, False]
+
+
+def test_batch_toggle_through_bus(editor):
+    ctrl, media_id = editor
+
+    BUS.wordsToggled.emit(media_id, [1, 3, 4], False)
+
+    keep = ctrl._mask_cache[media_id].keep
+    assert keep[:6].tolist() == [True, False, True, False, False, True]
+    assert ctrl._dirty == {media_id}
+
+
+def test_media_deleted_drops_cache(editor):
+    ctrl, media_id = editor
+    ctrl.toggle_word(media_id, 0, False)
+
+    BUS.mediaDeleted.emit(media_id)
+
+    assert media_id not in ctrl._mask_cache
+    assert media_id not in ctrl._words_cache
+    ctrl.flush_masks(wait=True)  # nothing left to write for the deleted media
+
+
+def test_media_path_cached_until_library_refresh(editor, tmp_path):
+    ctrl, media_id = editor
+    assert ctrl._media_path(media_id) == (Path("missing.mp4"), False)
+
+    media = tmp_path / "clip.mp4"
+    media.touch()
+    ctrl.db.update_media_path(media_id, str(media))
+    assert ctrl._media_path(media_id) == (media, True)
+
+    # Found paths are not re-checked until the library is refreshed
+    media.unlink()
+    assert ctrl._media_path(media_id) == (media, True)
+    BUS.refreshLibrary.emit()
+    assert ctrl._media_path(media_id) == (media, False)
+
+
+def test_write_srt_groups_on_gaps(tmp_path):
+    from ez_clip_app.core import EditMask
+    from ez_clip_app.core.models import Word
+
+    words = [Word(w="a", s=0.0, e=0.5), Word(w="b", s=0.6, e=1.0),
+             Word(w="cut", s=1.1, e=1.5), Word(w="c", s=3661.25, e=3662.5)]
+    srt = tmp_path / "out.srt"
+    EditorController._write_srt(None, words, EditMask(1, [True, True, False, True]), srt)
+
+    assert srt.read_text() == (
+        "1\n00:00:00,000 --> 00:00:01,000\na b\n\n"
+        "2\n01:01:01,250 --> 01:01:02,500\nc\n\n"
+    )
@@ -20,6 +20,10 @@ def test_markdown_roundtrip(fixture_data):
         ([{"start":0,"end":1,"text":"foo","speaker":"A"},
           {"start":1,"end":2,"text":"bar","speaker":"B"}],
          "**A:** foo\n\n**B:** bar"),
+        # out-of-order input is sorted by start
+        ([{"start":1,"end":2,"text":"bar","speaker":"B"},
+          {"start":0,"end":1,"text":"foo","speaker":"A"}],
+         "**A:** foo\n\n**B:** bar"),
     ]
 )
 def test_edge_cases(segments, expected):
@@ -6,6 +6,8 @@ Uses pytest for automated testing of imports from different modules.
 
 import sys
 import os
+import re
+from pathlib import Path
 import pytest
 
 # Add the parent directory to sys.path to allow imports from the root directory
@@ -28,6 +30,16 @@ def test_pipeline_imports():
     assert callable(process_file), "process_file should be a callable"
     assert JobSettings is not None, "JobSettings should be defined"
 
+def test_single_diarize_definition():
+    """Test that diarize() is defined in exactly one module of the package."""
+    pkg_dir = Path(__file__).parent.parent / "ez_clip_app"
+    defining = [
+        path.relative_to(pkg_dir).as_posix()
+        for path in pkg_dir.rglob("*.py")
+        if re.search(r"^def diarize\(", path.read_text(encoding="utf-8"), re.MULTILINE)
+    ]
+    assert defining == ["core/diarize.py"], f"diarize() defined in: {defining}"
+
 @pytest.mark.optional
 def test_ui_imports():
     """
@@ -0,0 +1,25 @@
+"""
+Tests for the job queue panel.
+"""
+from pathlib import Path
+
+from ez_clip_app.ui.panels.job_queue import JobQueuePanel
+
+
+def test_progress_repaints_only_on_new_percentage(qtbot):
+    panel = JobQueuePanel()
+    qtbot.addWidget(panel)
+    panel.add_job(3, Path("clip.mp4"))
+    job = panel.active_jobs[3]
+
+    panel.update_progress(3, 41.2)
+    job.progress_bar.setValue(0)  # a repeat of 41% must not touch the bar
+    panel.update_progress(3, 41.9)
+    assert job.progress_bar.value() == 0
+
+    panel.update_progress(3, 42.0)
+    assert job.progress_bar.value() == 42 == job.last_progress
+
+    panel.update_progress(99, 50.0)  # unknown jobs are ignored
+    panel.remove_job(3)
+    assert panel.active_jobs == {}
@@ -0,0 +1,55 @@
+"""
+Tests for the model server client: authentication and in-process fallback.
+"""
+import stat
+import threading
+
+import pytest
+
+from ez_clip_app.core import model_server, transcribe
+
+
+@pytest.fixture
+def key_file(tmp_path, monkeypatch):
+    path = tmp_path / "model_server.key"
+    monkeypatch.setattr(model_server, "MODEL_SERVER_AUTHKEY", None)
+    monkeypatch.setattr(model_server, "MODEL_SERVER_AUTHKEY_FILE", path)
+    return path
+
+
+def test_authkey_generated_private_and_reused(key_file):
+    key = model_server._authkey()
+
+    assert len(key) == 64
+    assert stat.S_IMODE(key_file.stat().st_mode) == 0o600
+    assert model_server._authkey() == key
+
+
+def test_connect_with_wrong_key_returns_none(key_file, tmp_path, monkeypatch):
+    sock = tmp_path / "s.sock"
+    manager = model_server.ModelManager(address=str(sock), authkey=b"other-key")
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(model_server, "MODEL_SERVER_SOCKET", sock)
+
+    assert model_server.connect() is None
+
+
+class _FailingRemote:
+    def __init__(self, exc):
+        self.exc = exc
+
+    def transcribe(self, audio, **kwargs):
+        raise self.exc
+
+
+def test_transcribe_falls_back_only_on_transport_errors(monkeypatch):
+    monkeypatch.setattr(transcribe, "transcribe_local", lambda audio, **kw: "local")
+
+    monkeypatch.setattr(model_server, "connect", lambda: _FailingRemote(EOFError()))
+    assert transcribe.transcribe("clip.wav") == "local"
+
+    # Errors raised by the work itself are not retried in-process
+    monkeypatch.setattr(model_server, "connect", lambda: _FailingRemote(ValueError("bad media")))
+    with pytest.raises(ValueError, match="bad media"):
+        transcribe.transcribe("clip.wav")
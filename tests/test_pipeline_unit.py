@@ -4,7 +4,7 @@ Drive process_file() with heavy functions patched → should finish instantly.
 import sqlite3
 from pathlib import Path
 import pytest
-from ez_clip_app.core.pipeline import process_file, JobSettings
+from ez_clip_app.core.pipeline import process_file, JobSettings, _ThrottledProgress
 from ez_clip_app.config import Status
 from ez_clip_app.data.database import DB
 
@@ -64,4 +64,49 @@ def test_process_file_fast(test_db, fixture_data, tmp_path):
     # Verify transcript identical to fixture
     result = test_db.get_transcript(1)
     assert result is not None
-    assert result.full_text == fixture_data["markdown"]
\ No newline at end of file
+    assert result.full_text == fixture_data["markdown"]
+
+@pytest.mark.usefixtures("patch_heavy_functions")
+def test_failed_job_waits_for_running_diarization(test_db, mocker, tmp_path):
+    import threading
+    import time
+
+    from ez_clip_app.core.pipeline import PipelineError
+
+    started, finished = threading.Event(), threading.Event()
+
+    def slow_diarization(*args, **kw):
+        started.set()
+        time.sleep(0.2)
+        finished.set()
+
+    def failing_transcription(*args, **kw):
+        started.wait(5)
+        raise RuntimeError("decoder exploded")
+
+    mocker.patch("ez_clip_app.core.diarize.diarize_audio", side_effect=slow_diarization)
+    mocker.patch("ez_clip_app.core.transcribe.transcribe", side_effect=failing_transcription)
+    dummy_video = tmp_path / "dummy.mp4"
+    dummy_video.write_bytes(b"0")
+
+    with pytest.raises(PipelineError):
+        process_file(dummy_video, JobSettings(diarize=True), test_db)
+
+    # The job only ends once the diarization it started has stopped
+    assert finished.is_set()
+
+def test_throttled_progress_coalesces_small_steps():
+    class Recorder:
+        def __init__(self):
+            self.writes = []
+
+        def update_progress(self, job_id, progress):
+            self.writes.append(progress)
+
+    rec = Recorder()
+    throttle = _ThrottledProgress(rec, 1, min_delta=1.0, min_interval=3600)
+    for p in (5, 5.2, 5.4, 6.1, 6.5, 7.1):
+        throttle.update(p)
+    throttle.update(7.2, force=True)
+
+    assert rec.writes == [5, 6.1, 7.1, 7.2]
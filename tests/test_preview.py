@@ -0,0 +1,74 @@
+"""
+Unit tests for the preview cache.
+"""
+import os
+
+from ez_clip_app.core.preview import _preview_name, evict_cache
+
+
+def test_preview_name_is_keyed_on_ranges():
+    ranges = [(0.0, 1.5), (3.0, 12.25)]
+    assert _preview_name(1, ranges) == _preview_name(1, list(ranges))
+    assert _preview_name(1, ranges) != _preview_name(2, ranges)
+    assert _preview_name(1, ranges) != _preview_name(1, [(0.0, 1.5), (3.0, 12.3)])
+
+
+def test_evict_cache_drops_oldest_clips(tmp_path):
+    media_dir = tmp_path / "1"
+    media_dir.mkdir()
+    for age, name in enumerate(["new.mp4", "mid.mp4", "old.mp4"]):
+        clip = media_dir / name
+        clip.write_bytes(b"x" * 100)
+        os.utime(clip, (1000 - age, 1000 - age))
+
+    evict_cache(tmp_path, max_bytes=200)
+
+    assert sorted(p.name for p in media_dir.iterdir()) == ["mid.mp4", "new.mp4"]
+
+
+def test_cancelled_build_is_skipped(tmp_path):
+    from ez_clip_app.core import EditMask, PreviewRebuilder
+
+    class Player:
+        def __init__(self):
+            self.loaded = []
+
+        def load(self, path):
+            self.loaded.append(path)
+
+    player = Player()
+    rebuilder = PreviewRebuilder(player)
+    media = tmp_path / "clip.mp4"
+
+    rebuilder.schedule(EditMask(1, [True]), [], media).cancel()
+    rebuilder._build()
+    assert player.loaded == []
+
+    rebuilder.schedule(EditMask(1, [True]), [], media)
+    rebuilder._build()
+    assert player.loaded == [media]
+
+
+def test_failed_build_leaves_no_cache_entry(tmp_path, monkeypatch):
+    import ffmpeg
+
+    from ez_clip_app.core import EditMask, PreviewRebuilder, preview
+    from ez_clip_app.core.models import Word
+
+    def failing_concat(src, ranges, dst):
+        dst.write_bytes(b"truncated")
+        raise ffmpeg.Error("ffmpeg", b"", b"disk full")
+
+    monkeypatch.setattr(preview, "PREVIEW_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(preview, "evict_cache", lambda: None)
+    monkeypatch.setattr(preview, "concat_ranges", failing_concat)
+    loaded = []
+    player = type("Player", (), {"load": lambda self, path: loaded.append(path)})()
+    rebuilder = PreviewRebuilder(player)
+    words = [Word(w="a", s=0.0, e=0.5), Word(w="b", s=1.0, e=1.5)]
+
+    rebuilder.schedule(EditMask(1, [True, False]), words, tmp_path / "clip.mp4")
+    rebuilder._build()
+
+    assert loaded == []
+    assert list((tmp_path / "1").iterdir()) == []
@@ -0,0 +1,29 @@
+"""
+Tests for the model-backed segment table panel.
+"""
+from PySide6.QtCore import Qt
+
+from ez_clip_app.core.models import Segment
+from ez_clip_app.ui.panels.segment_table import SegmentTablePanel
+
+
+def test_segments_model_formats_cells_on_demand(qtbot):
+    panel = SegmentTablePanel()
+    qtbot.addWidget(panel)
+    segments = [
+        Segment(id=7, speaker="SPEAKER_00", start_sec=0.0, end_sec=61.5, text="hello", words=[]),
+        Segment(id=9, speaker="SPEAKER_01", start_sec=61.5, end_sec=75.25, text="bye", words=[]),
+    ]
+
+    with qtbot.waitSignal(panel.segmentClicked) as first:
+        panel.set_segments(segments, {"SPEAKER_01": "Ada"})
+    assert first.args == [7]
+
+    model = panel.model
+    assert model.rowCount() == 2
+    assert [model.index(1, c).data() for c in range(4)] == ["Ada", "01:01.50", "01:15.25", "bye"]
+    assert model.index(1, 0).data(Qt.UserRole + 1) == "SPEAKER_01"
+    assert panel.segment_id_at(1) == 9 and panel.segment_id_at(2) is None
+
+    panel.clear()
+    assert model.rowCount() == 0
@@ -0,0 +1,97 @@
+"""
+Unit tests for the transcription wrapper: silence chunking and the pipeline pool.
+"""
+import pytest
+
+from ez_clip_app.core.transcribe import _chunks_from_silences
+
+
+def test_chunks_cut_at_silence_midpoints():
+    silences = [(100.0, 102.0), (650.0, 652.0), (900.0, 901.0), (1300.0, 1304.0)]
+    chunks = _chunks_from_silences(silences, duration=1500.0, min_chunk_sec=600)
+
+    assert chunks == [(0.0, 651.0), (651.0, 1302.0), (1302.0, 1500.0)]
+
+
+def test_chunks_without_silences_cover_whole_file():
+    assert _chunks_from_silences([], duration=42.0, min_chunk_sec=600) == [(0.0, 42.0)]
+
+
+def test_chunks_run_concurrently_on_separate_pipelines(monkeypatch):
+    import queue
+    import threading
+
+    import numpy as np
+
+    from ez_clip_app.core import model_cache, transcribe
+
+    class FakePipeline:
+        # Both chunks must be inside transcribe() at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def __init__(self):
+            self.busy = False
+
+        def transcribe(self, audio, language, batch_size):
+            assert not self.busy, "pipeline shared between threads"
+            self.busy = True
+            self.barrier.wait()
+            self.busy = False
+            return {"segments": [{"start": 0.0, "end": len(audio) / 16000}], "language": "en"}
+
+    pool = queue.Queue()
+    for _ in range(2):
+        pool.put(FakePipeline())
+    monkeypatch.setattr(model_cache, "get_whisper_pool", lambda model_size: pool)
+    monkeypatch.setattr(transcribe, "TRANSCRIBE_CHUNK_SEC", 1.0)
+    monkeypatch.setattr(transcribe, "_split_on_silence", lambda audio: [(0.0, 1.5), (1.5, 3.0)])
+
+    result = transcribe._transcribe_chunked(
+        "tiny", np.zeros(3 * 16000, np.float32), "en", 4, workers=2
+    )
+
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.0, 1.5), (1.5, 3.0)]
+    assert pool.qsize() == 2
+
+
+def test_whisper_pool_wraps_whisperx_model(monkeypatch):
+    import sys
+    import types
+
+    from ez_clip_app.core import model_cache
+
+    # Record what the pool hands to whisperx; the real model can't load here
+    asr = types.ModuleType("whisperx.asr")
+
+    class WhisperModel:
+        def __init__(self, model_size, **kwargs):
+            self.kwargs = kwargs
+
+        def generate_segment_batched(self, *args, **kwargs):
+            pass
+
+    asr.WhisperModel = WhisperModel
+    whisperx = types.ModuleType("whisperx")
+    whisperx.asr = asr
+    whisperx.load_model = lambda model_size, model=None, vad_model=None, **kw: (
+        types.SimpleNamespace(model=model, vad_model=vad_model or object())
+    )
+    monkeypatch.setitem(sys.modules, "whisperx", whisperx)
+    monkeypatch.setitem(sys.modules, "whisperx.asr", asr)
+    monkeypatch.setattr(model_cache, "_WHISPER_MODELS", {})
+    monkeypatch.setattr(model_cache, "TRANSCRIBE_WORKERS", 2)
+
+    pool = model_cache.get_whisper_pool("tiny")
+    first, second = pool.get(), pool.get()
+
+    # The pipeline calls generate_segment_batched, which only whisperx's
+    # WhisperModel subclass has
+    assert isinstance(first.model, asr.WhisperModel)
+    assert first.model is second.model
+    assert first.model.kwargs["num_workers"] == 2
+    assert second.vad_model is first.vad_model
+
+
+def test_whisperx_model_has_batched_generate():
+    asr = pytest.importorskip("whisperx.asr")
+    assert hasattr(asr.WhisperModel, "generate_segment_batched")
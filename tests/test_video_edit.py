@@ -0,0 +1,65 @@
+"""
+Unit tests for the ffmpeg helpers that don't need ffmpeg itself.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from ez_clip_app.core.video_edit import (
+    _keyframe_probe_cmd, _render_ranges_cmd, snap_to_keyframes
+)
+
+
+def test_starts_on_keyframes_are_copied():
+    keyframes = np.array([0.0, 2.0, 4.0, 6.0])
+    assert snap_to_keyframes([(0.0, 1.0), (4.02, 5.0), (6.0, 8.0)], keyframes) == [
+        (0.0, 1.0), (4.0, 5.0), (6.0, 8.0)
+    ]
+
+
+def test_short_cut_between_keyframes_is_never_brought_back():
+    # Copying from the keyframe at 4.0 would restore the cut 5.0-5.5
+    assert snap_to_keyframes([(0.0, 5.0), (5.5, 10.0)], np.array([0.0, 4.0])) is None
+    # ... as would starting a copy mid-GOP
+    assert snap_to_keyframes([(0.0, 1.0), (3.0, 5.0)], np.array([0.0, 2.0, 4.0])) is None
+
+
+def test_unalignable_ranges_need_reencode():
+    # Nothing to copy from before the first keyframe
+    assert snap_to_keyframes([(0.5, 1.0)], np.array([1.0, 3.0])) is None
+    # No keyframes found near the cuts
+    assert snap_to_keyframes([(1.3, 2.0)], np.array([])) is None
+    # A snap within tolerance must not reach into the previous range
+    assert snap_to_keyframes([(0.0, 2.03), (2.04, 3.0)], np.array([0.0, 2.0])) is None
+
+
+def test_keyframe_probe_reads_only_before_cuts():
+    cmd = _keyframe_probe_cmd(Path("in.mp4"), around=[3.0, 25.5])
+    assert cmd[cmd.index("-read_intervals") + 1] == "0.0%3.0,15.5%25.5"
+    assert "-read_intervals" not in _keyframe_probe_cmd(Path("in.mp4"))
+
+
+def test_render_ranges_is_one_filtergraph():
+    cmd = _render_ranges_cmd(Path("in.mp4"), [(0.0, 1.0), (2.0, 3.5)], Path("out.mp4"))
+
+    assert cmd.count("-i") == 1
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert graph.count("trim=") == 4  # trim + atrim per range
+    assert "concat=a=1:n=2:v=1" in graph
+
+
+def test_render_ranges_uses_fast_preset_and_crf():
+    cmd = _render_ranges_cmd(Path("in.mp4"), [(0.0, 1.0)], Path("out.mp4"))
+
+    assert cmd[cmd.index("-preset") + 1] == "veryfast"
+    assert "-crf" in cmd
+
+
+def test_render_ranges_without_audio_stream():
+    cmd = _render_ranges_cmd(Path("in.mp4"), [(0.0, 1.0), (2.0, 3.5)], Path("out.mp4"),
+                             audio=False)
+
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "atrim" not in graph
+    assert "concat=a=0:n=2:v=1" in graph
+    assert "-acodec" not in cmd